@@ -1,6 +1,8 @@
 # servicio central + inyección + demo
 
-from datetime import date
+import time
+from datetime import date, timedelta
+from typing import Iterable
 from billing_components import (
     Invoice,
     InvoiceGenerator,
@@ -13,6 +15,8 @@ from billing_components import (
     DatabaseInvoiceRepository,
     FileInvoiceRepository,
 )
+from billing_pipeline import BatchPipeline, BatchReport
+from instrumentation import StageHook, StageTimer, to_prometheus
 
 
 # Servicio central (DIP + SRP)
@@ -25,16 +29,54 @@ class BillingService:
         generator: InvoiceGenerator,
         sender: InvoiceSender,
         repository: InvoiceRepository,
+        hooks: Iterable[StageHook] = (),
     ) -> None:
         self._generator = generator
         self._sender = sender
         self._repository = repository
+        self._hooks = list(hooks)
+
+    def add_hook(self, hook: StageHook) -> None:
+        self._hooks.append(hook)
 
     def process_invoice(self, invoice: Invoice) -> None:
+        if self._hooks:
+            self._process_instrumented(invoice)
+            return
         document = self._generator.generate(invoice)
         self._repository.save(invoice, document)
         self._sender.send(invoice, document)
 
+    def _process_instrumented(self, invoice: Invoice) -> None:
+        document = self._timed("generate", invoice, self._generator.generate, invoice)
+        self._timed("save", invoice, self._repository.save, invoice, document)
+        self._timed("send", invoice, self._sender.send, invoice, document)
+
+    def _timed(self, stage: str, invoice: Invoice, step, *args):
+        hooks = self._hooks
+        for hook in hooks:
+            hook.before(stage, invoice)
+        error = None
+        start = time.perf_counter()
+        try:
+            return step(*args)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            for hook in hooks:
+                hook.after(stage, invoice, elapsed, error)
+
+    def process_batch(self, invoices: Iterable[Invoice], **options) -> BatchReport:
+        """
+        Procesa un lote grande en un pipeline de tres etapas acotadas, con los
+        mismos hooks que process_invoice. Las opciones (workers, chunk_size,
+        queue_size...) van a BatchPipeline.
+        """
+        pipeline = BatchPipeline(self._generator, self._repository, self._sender, hooks=self._hooks, **options)
+        return pipeline.run(invoices)
+
 
 # Demo
 
@@ -67,13 +109,31 @@ def demo() -> None:
 
     print("\n--- Cambiar almacenamiento sin tocar BillingService ---")
 
-    # Caso 3: PDF + File + API
+    # Caso 3: PDF + File + API, con tiempos por etapa
+    timer = StageTimer()
     service_api_file = BillingService(
         generator=PdfInvoiceGenerator(),
         sender=ApiInvoiceSender(),
         repository=FileInvoiceRepository(),
+        hooks=[timer],
     )
     service_api_file.process_invoice(invoice)
+    print(to_prometheus(timer.snapshot()), end="")
+
+    print("\n--- Procesar un lote con el pipeline por etapas ---")
+
+    batch = (
+        Invoice(
+            invoice_id=f"B-{n:04d}",
+            customer_email=f"cliente{n}@email.com",
+            customer_name=f"Cliente {n}",
+            amount=1000.0 * n,
+            issued_date=date.today() - timedelta(days=n),
+        )
+        for n in range(1, 6)
+    )
+    report = service_api_file.process_batch(batch, save_workers=2, send_workers=2)
+    print(report.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+# async_billing.py
+# Servicio de facturación asíncrono + adaptadores para las implementaciones síncronas
+from __future__ import annotations
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import AsyncIterable, Iterable, Optional, Union
+
+from billing_components import (
+    Invoice,
+    GeneratedDocument,
+    InvoiceGenerator,
+    InvoiceSender,
+    InvoiceRepository,
+    AsyncInvoiceSender,
+    AsyncInvoiceRepository,
+)
+
+
+# Adaptadores: reutilizan EmailInvoiceSender, FileInvoiceRepository, etc.
+# ejecutándolos en un executor para no bloquear el event loop.
+
+class ExecutorInvoiceSender(AsyncInvoiceSender):
+    def __init__(self, sender: InvoiceSender, executor: Optional[Executor] = None) -> None:
+        self._sender = sender
+        self._executor = executor
+
+    async def send(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, partial(self._sender.send, invoice, document))
+
+
+class ExecutorInvoiceRepository(AsyncInvoiceRepository):
+    def __init__(self, repository: InvoiceRepository, executor: Optional[Executor] = None) -> None:
+        self._repository = repository
+        self._executor = executor
+
+    async def save(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, partial(self._repository.save, invoice, document))
+
+
+@dataclass
+class AsyncBatchResult:
+    completed: int = 0
+    failures: list[tuple[str, BaseException]] = field(default_factory=list)
+
+
+# Servicio central asíncrono (mismo contrato que BillingService)
+
+class AsyncBillingService:
+    """
+    Orquesta generar -> guardar -> enviar sobre abstracciones asíncronas.
+    `concurrency` limita cuántas facturas están en vuelo a la vez.
+    """
+
+    def __init__(
+        self,
+        generator: InvoiceGenerator,
+        sender: AsyncInvoiceSender,
+        repository: AsyncInvoiceRepository,
+        concurrency: int = 100,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency debe ser >= 1")
+        self._generator = generator
+        self._sender = sender
+        self._repository = repository
+        self._concurrency = concurrency
+
+    async def process_invoice(self, invoice: Invoice) -> None:
+        document = self._generator.generate(invoice)
+        await self._repository.save(invoice, document)
+        await self._sender.send(invoice, document)
+
+    async def process_many(
+        self, invoices: Union[Iterable[Invoice], AsyncIterable[Invoice]]
+    ) -> AsyncBatchResult:
+        """
+        Procesa el flujo con `concurrency` workers que consumen de un mismo
+        iterador: la memoria no crece con el tamaño del lote.
+        """
+        result = AsyncBatchResult()
+        source = _SharedIterator(invoices)
+
+        async def worker() -> None:
+            async for invoice in source:
+                try:
+                    await self.process_invoice(invoice)
+                    result.completed += 1
+                except Exception as exc:
+                    result.failures.append((invoice.invoice_id, exc))
+
+        await asyncio.gather(*(worker() for _ in range(self._concurrency)))
+        return result
+
+
+class _SharedIterator:
+    """Iterador asíncrono compartido por varios workers."""
+
+    def __init__(self, invoices: Union[Iterable[Invoice], AsyncIterable[Invoice]]) -> None:
+        if hasattr(invoices, "__aiter__"):
+            self._async = invoices.__aiter__()
+            self._sync = None
+        else:
+            self._async = None
+            self._sync = iter(invoices)
+        self._lock = asyncio.Lock()
+
+    def __aiter__(self) -> "_SharedIterator":
+        return self
+
+    async def __anext__(self) -> Invoice:
+        if self._sync is not None:
+            try:
+                return next(self._sync)
+            except StopIteration:
+                raise StopAsyncIteration from None
+        async with self._lock:
+            return await self._async.__anext__()
+
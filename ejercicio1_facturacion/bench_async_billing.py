@@ -0,0 +1,66 @@
+# bench_async_billing.py
+# Benchmark offline: AsyncBillingService -> HttpInvoiceSender -> FakeInvoiceEndpoint
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from billing_components import AsyncInvoiceRepository, GeneratedDocument, Invoice, PdfInvoiceGenerator
+from async_billing import AsyncBillingService
+from fake_http_endpoint import FakeInvoiceEndpoint, HttpInvoiceSender
+
+
+class InMemoryAsyncRepository(AsyncInvoiceRepository):
+    def __init__(self) -> None:
+        self.saved = 0
+
+    async def save(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        self.saved += 1
+
+
+def invoices(count: int):
+    today = date.today()
+    for n in range(count):
+        yield Invoice(
+            invoice_id=f"A-{n}",
+            customer_email=f"cliente{n}@email.com",
+            customer_name=f"Cliente {n}",
+            amount=100.0 + n,
+            issued_date=today,
+        )
+
+
+async def run(count: int, concurrency: int, latency: float) -> None:
+    async with FakeInvoiceEndpoint(latency=latency) as endpoint:
+        sender = HttpInvoiceSender(endpoint.host, endpoint.port, pool_size=concurrency)
+        service = AsyncBillingService(
+            generator=PdfInvoiceGenerator(),
+            sender=sender,
+            repository=InMemoryAsyncRepository(),
+            concurrency=concurrency,
+        )
+        start = time.perf_counter()
+        result = await service.process_many(invoices(count))
+        elapsed = time.perf_counter() - start
+        await sender.close()
+
+    print(
+        f"concurrency={concurrency:<5} latency={latency * 1000:.0f}ms  "
+        f"{result.completed} enviadas en {elapsed:.2f}s -> {result.completed / elapsed:,.0f}/s "
+        f"({len(result.failures)} fallos, endpoint recibió {endpoint.requests})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.02, help="segundos por request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+    for concurrency in args.concurrency:
+        asyncio.run(run(args.count, concurrency, args.latency))
+
+
+if __name__ == "__main__":
+    main()
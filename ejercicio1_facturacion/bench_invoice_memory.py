@@ -0,0 +1,66 @@
+# bench_invoice_memory.py
+# Memoria: list[Invoice] vs list[SlottedInvoice] vs InvoiceBatch
+from __future__ import annotations
+import argparse
+import gc
+import sys
+import tracemalloc
+from datetime import date, timedelta
+
+from billing_components import Invoice, SlottedInvoice
+from invoice_batch import InvoiceBatch
+
+
+def rows(count: int, customers: int):
+    # Emails y nombres internados para las tres variantes (InvoiceBatch los
+    # interna igual): así la comparación mide sólo la disposición en memoria
+    today = date.today()
+    for n in range(count):
+        customer = n % customers
+        yield (
+            f"A-{n:08d}",
+            sys.intern(f"cliente{customer}@email.com"),
+            sys.intern(f"Cliente {customer}"),
+            100.0 + n,
+            today - timedelta(days=n % 365),
+        )
+
+
+def measure(label: str, count: int, build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} {current / 2**20:>9.1f} MiB  {current / count:>7.1f} bytes/factura")
+    del data
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--customers", type=int, default=10_000)
+    args = parser.parse_args()
+
+    def dataclasses() -> list[Invoice]:
+        return [Invoice(*row) for row in rows(args.count, args.customers)]
+
+    def slotted() -> list[SlottedInvoice]:
+        return [SlottedInvoice(*row) for row in rows(args.count, args.customers)]
+
+    def columnar() -> InvoiceBatch:
+        batch = InvoiceBatch()
+        for row in rows(args.count, args.customers):
+            batch.append(Invoice(*row))
+        return batch
+
+    print(f"{args.count:,} facturas, {args.customers:,} clientes distintos")
+    base = measure("list[Invoice]", args.count, dataclasses)
+    measure("list[SlottedInvoice]", args.count, slotted)
+    batch = measure("InvoiceBatch", args.count, columnar)
+    print(f"InvoiceBatch usa {batch / base:.0%} de list[Invoice]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench_pdf_generator.py
+# Microbenchmark: PdfInvoiceGenerator vs CompiledPdfInvoiceGenerator
+from __future__ import annotations
+import argparse
+import time
+from datetime import date, timedelta
+
+from billing_components import CompiledPdfInvoiceGenerator, Invoice, PdfInvoiceGenerator
+
+
+def sample_invoices(distinct: int) -> list[Invoice]:
+    today = date.today()
+    return [
+        Invoice(
+            invoice_id=f"A-{n:07d}",
+            customer_email=f"cliente{n}@email.com",
+            customer_name=f"Cliente Número {n}",
+            amount=round(100 + n * 1.37, 2),
+            issued_date=today - timedelta(days=n % 31),
+        )
+        for n in range(distinct)
+    ]
+
+
+def timed(label: str, count: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {elapsed:7.2f}s  {count / elapsed:>12,.0f} facturas/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=1_000, help="facturas distintas que se rotan")
+    args = parser.parse_args()
+
+    invoices = sample_invoices(args.distinct)
+    rounds, rest = divmod(args.count, len(invoices))
+    workload = invoices * rounds + invoices[:rest]
+
+    original = PdfInvoiceGenerator()
+    compiled = CompiledPdfInvoiceGenerator()
+    for invoice in invoices:
+        assert compiled.generate(invoice) == original.generate(invoice)
+
+    def run_original() -> None:
+        generate = original.generate
+        for invoice in workload:
+            generate(invoice)
+
+    def run_compiled() -> None:
+        generate = compiled.generate
+        for invoice in workload:
+            generate(invoice)
+
+    def run_render_into() -> None:
+        render_into = compiled.render_into
+        buffer = bytearray()
+        for invoice in workload:
+            render_into(invoice, buffer)
+            if len(buffer) > 1 << 20:
+                buffer.clear()
+
+    print(f"{args.count:,} facturas ({args.distinct} distintas)")
+    base = timed("PdfInvoiceGenerator.generate", args.count, run_original)
+    fast = timed("CompiledPdfInvoiceGenerator.generate", args.count, run_compiled)
+    timed("CompiledPdfInvoiceGenerator.render_into", args.count, run_render_into)
+    print(f"speedup generate: x{base / fast:.2f}")
+
+
+if __name__ == "__main__":
+    main()
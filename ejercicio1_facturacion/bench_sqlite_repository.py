@@ -0,0 +1,48 @@
+# bench_sqlite_repository.py
+# Inserciones/s de SqliteInvoiceRepository según el tamaño de lote
+from __future__ import annotations
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from billing_components import CompiledPdfInvoiceGenerator, Invoice
+from sqlite_repository import SqliteInvoiceRepository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10_000])
+    args = parser.parse_args()
+
+    generator = CompiledPdfInvoiceGenerator()
+    today = date.today()
+    pairs = []
+    for n in range(args.count):
+        invoice = Invoice(
+            invoice_id=f"A-{n}",
+            customer_email=f"cliente{n % 5000}@email.com",
+            customer_name=f"Cliente {n % 5000}",
+            amount=100.0 + n,
+            issued_date=today - timedelta(days=n % 365),
+        )
+        pairs.append((invoice, generator.generate(invoice)))
+
+    for batch_size in args.batch_sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            repository = SqliteInvoiceRepository(
+                Path(tmp) / "invoices.db", batch_size=batch_size, flush_interval=60.0
+            )
+            start = time.perf_counter()
+            for invoice, document in pairs:
+                repository.save(invoice, document)
+            repository.flush()
+            elapsed = time.perf_counter() - start
+            repository.close()
+        print(f"batch_size={batch_size:<7} {args.count / elapsed:>12,.0f} inserts/s  ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
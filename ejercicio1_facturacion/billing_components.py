@@ -19,11 +19,21 @@ class Invoice:
     issued_date: date
 
 
+@dataclass(frozen=True, slots=True)
+class SlottedInvoice:
+    """Misma factura sin __dict__ por instancia (menos memoria en lotes grandes)."""
+    invoice_id: str
+    customer_email: str
+    customer_name: str
+    amount: float
+    issued_date: date
+
+
 @dataclass(frozen=True)
 class GeneratedDocument:
     """Representa el 'PDF' generado (simulado)."""
     filename: str
-    content_bytes: bytes
+    content_bytes: bytes | memoryview
 
 
 # Interfaces (abstracciones) - DIP
@@ -46,6 +56,20 @@ class InvoiceRepository(ABC):
         ...
 
 
+# Variantes asíncronas (envío y guardado suelen ser I/O de red)
+
+class AsyncInvoiceSender(ABC):
+    @abstractmethod
+    async def send(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        ...
+
+
+class AsyncInvoiceRepository(ABC):
+    @abstractmethod
+    async def save(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        ...
+
+
 # Implementaciones (SRP)
 class PdfInvoiceGenerator(InvoiceGenerator):
     """Genera un PDF (aquí lo simulamos como bytes)."""
@@ -62,6 +86,54 @@ class PdfInvoiceGenerator(InvoiceGenerator):
         return GeneratedDocument(filename=filename, content_bytes=fake_pdf)
 
 
+class CompiledPdfInvoiceGenerator(InvoiceGenerator):
+    """
+    Mismo documento que PdfInvoiceGenerator, pero con la plantilla compilada:
+    las partes fijas se codifican una sola vez y solo se insertan los campos
+    variables. El resultado se arma con un único join (una sola copia).
+    """
+
+    _PARTS = (b"FACTURA ", b"\nCliente: ", b"\nFecha: ", b"\nTotal: ", b"\n")
+    _DATE_CACHE_SIZE = 4096
+
+    def __init__(self) -> None:
+        self._dates: dict[date, bytes] = {}
+
+    def _fields(self, invoice: Invoice) -> tuple[bytes, ...]:
+        issued = self._dates.get(invoice.issued_date)
+        if issued is None:
+            if len(self._dates) >= self._DATE_CACHE_SIZE:
+                self._dates.clear()
+            issued = self._dates[invoice.issued_date] = str(invoice.issued_date).encode("utf-8")
+        header, customer, issued_label, total, end = self._PARTS
+        return (
+            header, invoice.invoice_id.encode("utf-8"),
+            customer, invoice.customer_name.encode("utf-8"),
+            issued_label, issued,
+            total, str(invoice.amount).encode("utf-8"),
+            end,
+        )
+
+    def generate(self, invoice: Invoice) -> GeneratedDocument:
+        return GeneratedDocument(
+            filename=f"invoice_{invoice.invoice_id}.pdf",
+            content_bytes=b"".join(self._fields(invoice)),
+        )
+
+    def render_into(self, invoice: Invoice, buffer: bytearray) -> tuple[int, int]:
+        """
+        Agrega el documento al final de `buffer` (reutilizable entre facturas,
+        p. ej. para escrituras por lote) y retorna sus posiciones (inicio, fin).
+        Se devuelven posiciones y no una vista porque un bytearray con vistas
+        vivas no puede crecer: quien necesite una vista la toma al final con
+        memoryview(buffer)[inicio:fin].
+        """
+        start = len(buffer)
+        for part in self._fields(invoice):
+            buffer += part
+        return start, len(buffer)
+
+
 class EmailInvoiceSender(InvoiceSender):
     """Envía factura por email (simulado)."""
 
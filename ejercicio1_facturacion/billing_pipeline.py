@@ -0,0 +1,282 @@
+# billing_pipeline.py
+# Pipeline por lotes: generar -> guardar -> enviar en etapas paralelas
+from __future__ import annotations
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from billing_components import (
+    Invoice,
+    InvoiceGenerator,
+    InvoiceSender,
+    InvoiceRepository,
+)
+from instrumentation import StageHook
+
+
+# Métricas por etapa
+
+@dataclass
+class StageStats:
+    name: str
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, ok: int, failed: int, busy: float, started: float, finished: float) -> None:
+        with self._lock:
+            self.processed += ok
+            self.failed += failed
+            self.busy_seconds += busy
+            if self.started_at is None or started < self.started_at:
+                self.started_at = started
+            if self.finished_at is None or finished > self.finished_at:
+                self.finished_at = finished
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Facturas por segundo que completaron la etapa."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class StageFailure:
+    invoice_id: str
+    stage: str
+    error: BaseException
+
+
+@dataclass
+class BatchReport:
+    stages: dict[str, StageStats]
+    failures: list[StageFailure]
+    elapsed: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return self.stages["send"].processed
+
+    def summary(self) -> str:
+        lines = [f"Lote: {self.completed} facturas en {self.elapsed:.2f}s ({len(self.failures)} fallos)"]
+        for stats in self.stages.values():
+            lines.append(
+                f"  {stats.name:<8} {stats.processed:>8} ok  {stats.failed:>5} err  "
+                f"{stats.throughput:>10.1f}/s  ocupado {stats.busy_seconds:.2f}s"
+            )
+        return "\n".join(lines)
+
+
+# Trabajo de generación (se ejecuta en los procesos del pool)
+
+_worker_generator: Optional[InvoiceGenerator] = None
+
+
+def _init_generate_worker(generator: InvoiceGenerator) -> None:
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _generate_chunk(invoices: list[Invoice]) -> tuple[list[tuple], float]:
+    assert _worker_generator is not None
+    results = []
+    start = time.perf_counter()
+    for invoice in invoices:
+        began = time.perf_counter()
+        try:
+            document = _worker_generator.generate(invoice)
+            results.append((invoice, document, None, time.perf_counter() - began))
+        except Exception as exc:
+            results.append((invoice, None, exc, time.perf_counter() - began))
+    return results, time.perf_counter() - start
+
+
+def _chunks(invoices: Iterable[Invoice], size: int) -> Iterator[list[Invoice]]:
+    iterator = iter(invoices)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+_DONE = object()
+
+
+class BatchPipeline:
+    """
+    Procesa un flujo de facturas en tres etapas con colas acotadas entre ellas.
+
+    - generate: pool de procesos (CPU), en bloques de `chunk_size` facturas
+    - save / send: pool de hilos (I/O)
+
+    Las colas acotadas aplican backpressure: si el envío es lento, se llena
+    `send_queue`, se bloquean los guardados, luego la recolección de documentos
+    generados y finalmente la lectura de facturas. Así nunca hay más de
+    ~`queue_size * 2 + max_in_flight_chunks * chunk_size` documentos en memoria.
+
+    Los `hooks` (StageHook) se llaman por factura en las tres etapas. La
+    generación corre en otros procesos: su duración se mide allí y los hooks
+    reciben `before`/`after` juntos, en este proceso, al recolectar el bloque.
+    """
+
+    def __init__(
+        self,
+        generator: InvoiceGenerator,
+        repository: InvoiceRepository,
+        sender: InvoiceSender,
+        *,
+        generate_workers: Optional[int] = None,
+        save_workers: int = 4,
+        send_workers: int = 4,
+        chunk_size: int = 64,
+        queue_size: int = 1024,
+        max_in_flight_chunks: Optional[int] = None,
+        hooks: Iterable[StageHook] = (),
+    ) -> None:
+        if save_workers < 1 or send_workers < 1 or chunk_size < 1 or queue_size < 1:
+            raise ValueError("workers, chunk_size y queue_size deben ser >= 1")
+        self._generator = generator
+        self._repository = repository
+        self._sender = sender
+        self._generate_workers = generate_workers
+        self._save_workers = save_workers
+        self._send_workers = send_workers
+        self._chunk_size = chunk_size
+        self._queue_size = queue_size
+        self._max_in_flight = max_in_flight_chunks or 2 * (generate_workers or 4)
+        self._hooks = list(hooks)
+
+    def _run_stage(self, stage: str, invoice: Invoice, step, *args) -> None:
+        # Ejecuta la etapa avisando a los hooks; relanza el error
+        hooks = self._hooks
+        for hook in hooks:
+            hook.before(stage, invoice)
+        error = None
+        start = time.perf_counter()
+        try:
+            step(*args)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            for hook in hooks:
+                hook.after(stage, invoice, elapsed, error)
+
+    def run(self, invoices: Iterable[Invoice]) -> BatchReport:
+        stages = {name: StageStats(name) for name in ("generate", "save", "send")}
+        failures: list[StageFailure] = []
+        failures_lock = threading.Lock()
+
+        def fail(invoice: Invoice, stage: str, error: BaseException) -> None:
+            with failures_lock:
+                failures.append(StageFailure(invoice.invoice_id, stage, error))
+
+        pending: queue.Queue = queue.Queue(maxsize=self._max_in_flight)
+        save_queue: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        send_queue: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        savers_left = [self._save_workers]
+        savers_lock = threading.Lock()
+
+        def collect() -> None:
+            item = None
+            try:
+                while (item := pending.get()) is not _DONE:
+                    chunk, future = item
+                    try:
+                        results, busy = future.result()
+                    except Exception as exc:
+                        for invoice in chunk:
+                            fail(invoice, "generate", exc)
+                        now = time.perf_counter()
+                        stages["generate"].record(0, len(chunk), 0.0, now, now)
+                        continue
+                    now = time.perf_counter()
+                    ok = 0
+                    for invoice, document, error, elapsed in results:
+                        try:
+                            for hook in self._hooks:
+                                hook.before("generate", invoice)
+                                hook.after("generate", invoice, elapsed, error)
+                        except Exception as exc:
+                            # Un hook que falla hace fallar la etapa, como en _run_stage
+                            error = error or exc
+                        if error is not None:
+                            fail(invoice, "generate", error)
+                            continue
+                        ok += 1
+                        save_queue.put((invoice, document))
+                    stages["generate"].record(ok, len(results) - ok, busy, now - busy, now)
+            finally:
+                # Los guardadores terminan aunque la recolección se corte, y se
+                # sigue vaciando `pending` para que run() no quede bloqueado
+                for _ in range(self._save_workers):
+                    save_queue.put(_DONE)
+                while item is not _DONE:
+                    item = pending.get()
+
+        def save() -> None:
+            while (item := save_queue.get()) is not _DONE:
+                invoice, document = item
+                start = time.perf_counter()
+                try:
+                    self._run_stage("save", invoice, self._repository.save, invoice, document)
+                except Exception as exc:
+                    end = time.perf_counter()
+                    stages["save"].record(0, 1, end - start, start, end)
+                    fail(invoice, "save", exc)
+                    continue
+                end = time.perf_counter()
+                stages["save"].record(1, 0, end - start, start, end)
+                send_queue.put(item)
+            with savers_lock:
+                savers_left[0] -= 1
+                last = savers_left[0] == 0
+            if last:
+                for _ in range(self._send_workers):
+                    send_queue.put(_DONE)
+
+        def send() -> None:
+            while (item := send_queue.get()) is not _DONE:
+                invoice, document = item
+                start = time.perf_counter()
+                try:
+                    self._run_stage("send", invoice, self._sender.send, invoice, document)
+                except Exception as exc:
+                    end = time.perf_counter()
+                    stages["send"].record(0, 1, end - start, start, end)
+                    fail(invoice, "send", exc)
+                    continue
+                end = time.perf_counter()
+                stages["send"].record(1, 0, end - start, start, end)
+
+        started = time.perf_counter()
+        io_workers = 1 + self._save_workers + self._send_workers
+        with ProcessPoolExecutor(
+            max_workers=self._generate_workers,
+            initializer=_init_generate_worker,
+            initargs=(self._generator,),
+        ) as cpu_pool, ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+            io_futures: list[Future] = [io_pool.submit(collect)]
+            io_futures += [io_pool.submit(save) for _ in range(self._save_workers)]
+            io_futures += [io_pool.submit(send) for _ in range(self._send_workers)]
+            try:
+                for chunk in _chunks(invoices, self._chunk_size):
+                    pending.put((chunk, cpu_pool.submit(_generate_chunk, chunk)))
+            finally:
+                pending.put(_DONE)
+            for future in io_futures:
+                future.result()
+
+        return BatchReport(stages=stages, failures=failures, elapsed=time.perf_counter() - started)
+
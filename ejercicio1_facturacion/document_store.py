@@ -0,0 +1,164 @@
+# document_store.py
+# Almacenamiento direccionado por contenido: cada documento se escribe una sola vez
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from billing_components import GeneratedDocument, Invoice, InvoiceRepository
+
+
+@dataclass
+class StoreStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_written: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ContentAddressedDocumentStore:
+    """
+    Guarda bytes bajo su digest SHA-256 (`<base>/objects/ab/cdef...`).
+    Un LRU en memoria (acotado en bytes) evita tocar disco para contenidos
+    recientes; si el digest ya existe en disco tampoco se vuelve a escribir.
+    """
+
+    def __init__(self, base_dir: Union[str, Path], cache_bytes: int = 64 * 1024 * 1024) -> None:
+        self._objects = Path(base_dir) / "objects"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._cache_bytes = cache_bytes
+        self._cached = 0
+        self._lock = threading.Lock()
+        self.stats = StoreStats()
+
+    def _path(self, digest: str) -> Path:
+        return self._objects / digest[:2] / digest[2:]
+
+    def _remember(self, digest: str, content: bytes) -> None:
+        # Se llama con el lock tomado
+        if len(content) > self._cache_bytes:
+            return
+        self._cache[digest] = content
+        self._cached += len(content)
+        while self._cached > self._cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached -= len(evicted)
+
+    def put(self, content: bytes) -> str:
+        content = bytes(content)
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                self.stats.hits += 1
+                self.stats.bytes_saved += len(content)
+                return digest
+
+        path = self._path(digest)
+        written = not path.exists()
+        if written:
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, path)
+
+        with self._lock:
+            if written:
+                self.stats.misses += 1
+                self.stats.bytes_written += len(content)
+            else:
+                self.stats.hits += 1
+                self.stats.bytes_saved += len(content)
+            self._remember(digest, content)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        with self._lock:
+            content = self._cache.get(digest)
+            if content is not None:
+                self._cache.move_to_end(digest)
+                return content
+        content = self._path(digest).read_bytes()
+        with self._lock:
+            self._remember(digest, content)
+        return content
+
+    def __contains__(self, digest: str) -> bool:
+        with self._lock:
+            if digest in self._cache:
+                return True
+        return self._path(digest).exists()
+
+
+class ContentAddressedInvoiceRepository(InvoiceRepository):
+    """
+    Repositorio en archivos con deduplicación: el documento va al store por
+    digest y la factura solo se enlaza (`links.jsonl`: una lista JSON
+    [id, digest, filename] por línea, así un tab o salto de línea en un campo
+    no rompe el archivo). Al abrir se saltea una línea mal formada, como la
+    última a medio escribir si el proceso cayó.
+    Reprocesar un lote ya guardado no escribe ni documentos ni enlaces.
+    """
+
+    def __init__(
+        self,
+        base_dir: Union[str, Path],
+        cache_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self._base = Path(base_dir)
+        self.store = ContentAddressedDocumentStore(self._base, cache_bytes)
+        self._links: dict[str, tuple[str, str]] = {}
+        self._links_path = self._base / "links.jsonl"
+        self._lock = threading.Lock()
+        torn = False
+        if self._links_path.exists():
+            with self._links_path.open(encoding="utf-8") as f:
+                for line in f:
+                    torn = not line.endswith("\n")
+                    try:
+                        invoice_id, digest, filename = json.loads(line)
+                    except (ValueError, TypeError):
+                        continue
+                    self._links[invoice_id] = (digest, filename)
+        self._links_file = self._links_path.open("a", encoding="utf-8")
+        if torn:
+            # Cierra la línea cortada para que el próximo enlace empiece en una nueva
+            self._links_file.write("\n")
+
+    @property
+    def stats(self) -> StoreStats:
+        return self.store.stats
+
+    def save(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        digest = self.store.put(document.content_bytes)
+        link = (digest, document.filename)
+        with self._lock:
+            if self._links.get(invoice.invoice_id) == link:
+                return
+            self._links[invoice.invoice_id] = link
+            self._links_file.write(
+                json.dumps([invoice.invoice_id, digest, document.filename], separators=(",", ":")) + "\n"
+            )
+            self._links_file.flush()
+
+    def load(self, invoice_id: str) -> Optional[GeneratedDocument]:
+        with self._lock:
+            link = self._links.get(invoice_id)
+        if link is None:
+            return None
+        digest, filename = link
+        return GeneratedDocument(filename=filename, content_bytes=self.store.get(digest))
+
+    def close(self) -> None:
+        self._links_file.close()
@@ -0,0 +1,122 @@
+# fake_http_endpoint.py
+# Endpoint HTTP local (simulado) + sender HTTP asíncrono, para medir sin red real
+from __future__ import annotations
+import asyncio
+from typing import Optional
+
+from billing_components import AsyncInvoiceSender, GeneratedDocument, Invoice
+
+
+class FakeInvoiceEndpoint:
+    """
+    Servidor HTTP/1.1 mínimo con keep-alive que acepta `POST /invoices`
+    y responde 202 tras una latencia configurable.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> None:
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.requests = 0
+        self.bytes_received = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self) -> "FakeInvoiceEndpoint":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._connections:
+            # Los clientes ya cerraron: se da tiempo a que los handlers lean EOF
+            _, still_open = await asyncio.wait(self._connections, timeout=1.0)
+            for task in still_open:
+                task.cancel()
+            await asyncio.gather(*still_open, return_exceptions=True)
+
+    async def __aenter__(self) -> "FakeInvoiceEndpoint":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b""
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                self.requests += 1
+                self.bytes_received += len(body)
+                writer.write(b"HTTP/1.1 202 Accepted\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+class HttpInvoiceSender(AsyncInvoiceSender):
+    """
+    Envía el documento por HTTP (POST) reutilizando hasta `pool_size`
+    conexiones keep-alive.
+    """
+
+    def __init__(self, host: str, port: int, path: str = "/invoices", pool_size: int = 50) -> None:
+        self._host = host
+        self._port = port
+        self._path = path
+        self._pool_size = pool_size
+        self._idle: Optional[asyncio.LifoQueue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def send(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._pool_size)
+            self._idle = asyncio.LifoQueue()
+        async with self._slots:
+            if self._idle.empty():
+                reader, writer = await asyncio.open_connection(self._host, self._port)
+            else:
+                reader, writer = self._idle.get_nowait()
+            try:
+                body = bytes(document.content_bytes)
+                writer.write(
+                    f"POST {self._path} HTTP/1.1\r\n"
+                    f"Host: {self._host}\r\n"
+                    f"X-Invoice-Id: {invoice.invoice_id}\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+                )
+                await writer.drain()
+                status = await reader.readline()
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    pass
+            except BaseException:
+                writer.close()
+                raise
+            if not status.startswith(b"HTTP/1.1 2"):
+                writer.close()
+                raise RuntimeError(f"Envío de {invoice.invoice_id} rechazado: {status!r}")
+            self._idle.put_nowait((reader, writer))
+
+    async def close(self) -> None:
+        while self._idle is not None and not self._idle.empty():
+            _, writer = self._idle.get_nowait()
+            writer.close()
+            await writer.wait_closed()
@@ -0,0 +1,87 @@
+# instrumentation.py
+# Hooks por etapa para BillingService + exportadores (JSON / Prometheus)
+from __future__ import annotations
+import json
+import threading
+from typing import Optional
+
+from billing_components import Invoice
+from metrics import LatencyHistogram
+
+
+STAGES = ("generate", "save", "send")
+
+
+class StageHook:
+    """
+    Hook de instrumentación. `before` se llama antes de cada etapa y `after`
+    al terminar, con la duración (reloj monotónico) y la excepción si falló.
+    Ambos son opcionales: por defecto no hacen nada.
+    """
+
+    def before(self, stage: str, invoice: Invoice) -> None:
+        pass
+
+    def after(
+        self, stage: str, invoice: Invoice, elapsed: float, error: Optional[BaseException]
+    ) -> None:
+        pass
+
+
+class StageTimer(StageHook):
+    """Histograma de latencia y contador de errores por etapa."""
+
+    def __init__(self) -> None:
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.errors = dict.fromkeys(STAGES, 0)
+        self._lock = threading.Lock()
+
+    def after(
+        self, stage: str, invoice: Invoice, elapsed: float, error: Optional[BaseException]
+    ) -> None:
+        self.histograms[stage].record(elapsed)
+        if error is not None:
+            with self._lock:
+                self.errors[stage] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            errors = dict(self.errors)
+        return {
+            stage: {**histogram.snapshot(), "errors": errors[stage]}
+            for stage, histogram in self.histograms.items()
+        }
+
+    def reset(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.reset()
+        with self._lock:
+            self.errors = dict.fromkeys(STAGES, 0)
+
+
+# Exportadores
+
+def to_json(snapshot: dict[str, dict]) -> str:
+    return json.dumps(snapshot, indent=2, sort_keys=True)
+
+
+def to_prometheus(snapshot: dict[str, dict], prefix: str = "billing") -> str:
+    """Formato de texto de Prometheus: un summary por etapa + contador de errores."""
+    name = f"{prefix}_stage_duration_seconds"
+    lines = [
+        f"# HELP {name} Duración de cada etapa de BillingService.",
+        f"# TYPE {name} summary",
+    ]
+    for stage, stats in snapshot.items():
+        for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+            lines.append(f'{name}{{stage="{stage}",quantile="{quantile}"}} {stats[key]:.9f}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {stats["mean"] * stats["count"]:.9f}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+    errors = f"{prefix}_stage_errors_total"
+    lines += [
+        f"# HELP {errors} Errores por etapa de BillingService.",
+        f"# TYPE {errors} counter",
+    ]
+    for stage, stats in snapshot.items():
+        lines.append(f'{errors}{{stage="{stage}"}} {stats["errors"]}')
+    return "\n".join(lines) + "\n"
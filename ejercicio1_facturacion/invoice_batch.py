@@ -0,0 +1,114 @@
+# invoice_batch.py
+# Lote de facturas en columnas: menos memoria que una lista de dataclasses
+from __future__ import annotations
+import sys
+from array import array
+from datetime import date
+from typing import Iterable, Iterator, Union
+
+from billing_components import Invoice, SlottedInvoice
+
+
+class InvoiceBatch:
+    """
+    Guarda cada campo en su propia columna: ids, emails y nombres en listas
+    (emails y nombres internados, porque los clientes se repiten), montos en
+    array('d') y fechas como ordinales en array('l').
+    """
+
+    __slots__ = ("invoice_ids", "customer_emails", "customer_names", "amounts", "issued_ordinals")
+
+    def __init__(self, invoices: Iterable[Union[Invoice, SlottedInvoice, "InvoiceRow"]] = ()) -> None:
+        self.invoice_ids: list[str] = []
+        self.customer_emails: list[str] = []
+        self.customer_names: list[str] = []
+        self.amounts = array("d")
+        self.issued_ordinals = array("l")
+        self.extend(invoices)
+
+    def append(self, invoice: Union[Invoice, SlottedInvoice, "InvoiceRow"]) -> None:
+        self.invoice_ids.append(invoice.invoice_id)
+        self.customer_emails.append(sys.intern(invoice.customer_email))
+        self.customer_names.append(sys.intern(invoice.customer_name))
+        self.amounts.append(invoice.amount)
+        self.issued_ordinals.append(invoice.issued_date.toordinal())
+
+    def extend(self, invoices: Iterable[Union[Invoice, SlottedInvoice, "InvoiceRow"]]) -> None:
+        for invoice in invoices:
+            self.append(invoice)
+
+    def __len__(self) -> int:
+        return len(self.invoice_ids)
+
+    def __getitem__(self, index: int) -> "InvoiceRow":
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice fuera del lote")
+        return InvoiceRow(self, index)
+
+    def __iter__(self) -> Iterator["InvoiceRow"]:
+        for index in range(len(self)):
+            yield InvoiceRow(self, index)
+
+    def total_amount(self) -> float:
+        return sum(self.amounts)
+
+
+class InvoiceRow:
+    """
+    Vista de una fila del lote con la misma interfaz que Invoice
+    (invoice_id, customer_email, customer_name, amount, issued_date),
+    sin copiar los datos.
+    """
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: InvoiceBatch, index: int) -> None:
+        self._batch = batch
+        self._index = index
+
+    @property
+    def invoice_id(self) -> str:
+        return self._batch.invoice_ids[self._index]
+
+    @property
+    def customer_email(self) -> str:
+        return self._batch.customer_emails[self._index]
+
+    @property
+    def customer_name(self) -> str:
+        return self._batch.customer_names[self._index]
+
+    @property
+    def amount(self) -> float:
+        return self._batch.amounts[self._index]
+
+    @property
+    def issued_date(self) -> date:
+        return date.fromordinal(self._batch.issued_ordinals[self._index])
+
+    def to_invoice(self) -> Invoice:
+        return Invoice(
+            invoice_id=self.invoice_id,
+            customer_email=self.customer_email,
+            customer_name=self.customer_name,
+            amount=self.amount,
+            issued_date=self.issued_date,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        fields = ("invoice_id", "customer_email", "customer_name", "amount", "issued_date")
+        try:
+            return all(getattr(self, name) == getattr(other, name) for name in fields)
+        except AttributeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"InvoiceRow(invoice_id={self.invoice_id!r}, customer_email={self.customer_email!r}, "
+            f"customer_name={self.customer_name!r}, amount={self.amount!r}, "
+            f"issued_date={self.issued_date!r})"
+        )
@@ -0,0 +1,102 @@
+# metrics.py
+# Histograma de latencias estilo HDR (buckets log-lineales, memoria fija)
+from __future__ import annotations
+import threading
+from typing import Optional
+
+
+class LatencyHistogram:
+    """
+    Registra latencias en microsegundos en buckets log-lineales: 16 sub-buckets
+    por cada potencia de 2, lo que da un error relativo máximo de ~6% en los
+    percentiles con memoria constante (no guarda las muestras).
+    """
+
+    _SUB_BITS = 4
+    _SUB = 1 << _SUB_BITS
+    _BUCKETS = _SUB * 48  # hasta ~2**47 µs, de sobra
+
+    def __init__(self) -> None:
+        self._counts = [0] * self._BUCKETS
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.min: Optional[float] = None
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        if micros < cls._SUB:
+            return micros
+        shift = micros.bit_length() - cls._SUB_BITS - 1
+        return min((shift + 1) * cls._SUB + (micros >> shift) - cls._SUB, cls._BUCKETS - 1)
+
+    @classmethod
+    def _value(cls, index: int) -> float:
+        """Punto medio del bucket, en microsegundos."""
+        if index < cls._SUB:
+            return float(index)
+        shift = index // cls._SUB - 1
+        low = (index % cls._SUB + cls._SUB) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, seconds: float) -> None:
+        index = self._index(int(seconds * 1_000_000))
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            if self.min is None or seconds < self.min:
+                self.min = seconds
+
+    def percentile(self, p: float) -> float:
+        """Percentil `p` (0-100) en segundos."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(1, round(self.count * p / 100))
+            seen = 0
+            for index, bucket in enumerate(self._counts):
+                seen += bucket
+                if seen >= target:
+                    return min(self._value(index) / 1_000_000, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        with other._lock:
+            counts = list(other._counts)
+            count, total, high, low = other.count, other.total, other.max, other.min
+        with self._lock:
+            for index, bucket in enumerate(counts):
+                if bucket:
+                    self._counts[index] += bucket
+            self.count += count
+            self.total += total
+            self.max = max(self.max, high)
+            if low is not None and (self.min is None or low < self.min):
+                self.min = low
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * self._BUCKETS
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+            self.min = None
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min or 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
@@ -0,0 +1,314 @@
+# resilient_sender.py
+# Envío resiliente: reintentos con backoff, circuit breaker y dead-letter queue
+from __future__ import annotations
+import base64
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterator, Mapping, Optional, Union
+
+from billing_components import GeneratedDocument, Invoice, InvoiceSender
+from metrics import LatencyHistogram
+
+
+# Reintentos
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff exponencial con 'full jitter': espera U(0, min(max, base * 2**n))."""
+    max_attempts: int = 4
+    base_delay: float = 0.1
+    max_delay: float = 5.0
+
+    def delay(self, attempt: int, rng: random.Random) -> float:
+        return rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+# Circuit breaker
+
+class CircuitBreaker:
+    """
+    closed -> open tras `failure_threshold` fallos seguidos; open -> half_open
+    pasado `reset_timeout`; en half_open un intento exitoso cierra el circuito
+    y uno fallido lo vuelve a abrir.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self._reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+
+# Dead-letter queue en disco
+
+@dataclass(frozen=True)
+class DeadLetter:
+    channel: str
+    invoice: Invoice
+    document: GeneratedDocument
+    error: str
+    attempts: int
+    failed_at: float
+
+
+class DeadLetterQueue:
+    """
+    Archivo JSON Lines con los envíos que agotaron sus reintentos. Cada entrada
+    se escribe con fsync para sobrevivir a una caída; `replay` reintenta y deja
+    en el archivo solo lo que vuelve a fallar.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def push(self, letter: DeadLetter) -> None:
+        line = json.dumps(_encode_letter(letter), separators=(",", ":")) + "\n"
+        with self._lock, self._path.open("a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __iter__(self) -> Iterator[DeadLetter]:
+        with self._lock:
+            if not self._path.exists():
+                return iter(())
+            lines = self._path.read_text(encoding="utf-8").splitlines()
+        return (_decode_letter(json.loads(line)) for line in lines if line)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def replay(self, senders: Mapping[str, InvoiceSender]) -> tuple[int, int]:
+        """Reenvía cada entrada por el sender de su canal. Retorna (reenviadas, pendientes)."""
+        with self._lock:
+            if not self._path.exists():
+                return 0, 0
+            lines = [line for line in self._path.read_text(encoding="utf-8").splitlines() if line]
+            remaining = []
+            for line in lines:
+                letter = _decode_letter(json.loads(line))
+                sender = senders.get(letter.channel)
+                try:
+                    if sender is None:
+                        raise LookupError(f"Sin sender para el canal {letter.channel}")
+                    sender.send(letter.invoice, letter.document)
+                except Exception:
+                    remaining.append(line)
+            tmp = self._path.with_suffix(".tmp")
+            tmp.write_text("".join(line + "\n" for line in remaining), encoding="utf-8")
+            os.replace(tmp, self._path)
+        return len(lines) - len(remaining), len(remaining)
+
+
+def _encode_letter(letter: DeadLetter) -> dict:
+    invoice = letter.invoice
+    return {
+        "channel": letter.channel,
+        "invoice": {
+            "invoice_id": invoice.invoice_id,
+            "customer_email": invoice.customer_email,
+            "customer_name": invoice.customer_name,
+            "amount": invoice.amount,
+            "issued_date": invoice.issued_date.isoformat(),
+        },
+        "filename": letter.document.filename,
+        "content": base64.b64encode(letter.document.content_bytes).decode("ascii"),
+        "error": letter.error,
+        "attempts": letter.attempts,
+        "failed_at": letter.failed_at,
+    }
+
+
+def _decode_letter(data: dict) -> DeadLetter:
+    invoice = dict(data["invoice"])
+    invoice["issued_date"] = date.fromisoformat(invoice["issued_date"])
+    return DeadLetter(
+        channel=data["channel"],
+        invoice=Invoice(**invoice),
+        document=GeneratedDocument(
+            filename=data["filename"], content_bytes=base64.b64decode(data["content"])
+        ),
+        error=data["error"],
+        attempts=data["attempts"],
+        failed_at=data["failed_at"],
+    )
+
+
+# Sender resiliente (decorador de cualquier InvoiceSender)
+
+class ResilientInvoiceSender(InvoiceSender):
+    """
+    Envuelve el sender de un canal. Reintenta con backoff, corta el canal con
+    un circuit breaker cuando falla en serie y, si no logra enviar, manda la
+    factura a la dead-letter queue en vez de propagar la excepción (el
+    documento ya quedó guardado, se podrá reenviar con `replay`).
+    """
+
+    def __init__(
+        self,
+        sender: InvoiceSender,
+        dead_letters: DeadLetterQueue,
+        channel: Optional[str] = None,
+        retry: RetryPolicy = RetryPolicy(),
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._sender = sender
+        self._dead_letters = dead_letters
+        self.channel = channel or sender.__class__.__name__
+        self._retry = retry
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self.latency = LatencyHistogram()
+        self.counters: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+    def _count(self, name: str, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.counters[name] += 1
+            if error is not None:
+                self.errors[type(error).__name__] += 1
+
+    def send(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        last_error: Optional[BaseException] = None
+        attempts = 0
+        for attempt in range(self._retry.max_attempts):
+            if not self.breaker.allow():
+                self._count("short_circuited")
+                break
+            if attempt:
+                self._count("retries")
+            attempts += 1
+            start = time.perf_counter()
+            try:
+                self._sender.send(invoice, document)
+            except Exception as exc:
+                self.latency.record(time.perf_counter() - start)
+                self.breaker.record_failure()
+                self._count("failed_attempts", exc)
+                last_error = exc
+                if attempt + 1 < self._retry.max_attempts:
+                    self._sleep(self._retry.delay(attempt, self._rng))
+                continue
+            self.latency.record(time.perf_counter() - start)
+            self.breaker.record_success()
+            self._count("sent")
+            return
+
+        self._count("dead_lettered")
+        self._dead_letters.push(
+            DeadLetter(
+                channel=self.channel,
+                invoice=invoice,
+                document=document,
+                error=repr(last_error) if last_error else "circuit open",
+                attempts=attempts,
+                failed_at=time.time(),
+            )
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+            errors = dict(self.errors)
+        return {
+            "channel": self.channel,
+            "circuit": self.breaker.state,
+            "counters": counters,
+            "errors": errors,
+            "latency": self.latency.snapshot(),
+        }
+
+
+# Fake para pruebas: inyecta fallos y latencia
+
+class FlakyInvoiceSender(InvoiceSender):
+    """Falla con probabilidad `failure_rate` (o las primeras `fail_first` veces)."""
+
+    def __init__(
+        self,
+        failure_rate: float = 0.0,
+        fail_first: int = 0,
+        latency: float = 0.0,
+        error: type[Exception] = ConnectionError,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._failure_rate = failure_rate
+        self._fail_first = fail_first
+        self._latency = latency
+        self._error = error
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.delivered: list[str] = []
+
+    def send(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        with self._lock:
+            self.calls += 1
+            fail = self.calls <= self._fail_first or self._rng.random() < self._failure_rate
+        if self._latency:
+            time.sleep(self._latency)
+        if fail:
+            raise self._error(f"Fallo inyectado enviando {invoice.invoice_id}")
+        with self._lock:
+            self.delivered.append(invoice.invoice_id)
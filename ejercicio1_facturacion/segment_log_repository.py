@@ -0,0 +1,203 @@
+# segment_log_repository.py
+# Repositorio en log append-only con segmentos rotados por tamaño
+from __future__ import annotations
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Optional, Union
+
+from billing_components import GeneratedDocument, Invoice, InvoiceRepository
+
+
+# Registro: cabecera | metadata JSON | bytes del documento
+# cabecera = magic, len(metadata), len(documento), crc32(metadata + documento)
+_HEADER = struct.Struct("<4sIII")
+_MAGIC = b"INV1"
+
+
+class SegmentedLogInvoiceRepository(InvoiceRepository):
+    """
+    Agrega cada factura (metadata + documento) al segmento activo en vez de
+    crear un archivo por factura. Los segmentos rotan al superar
+    `segment_bytes` y el fsync se hace por grupos (`sync_every` registros o
+    `sync_interval` segundos, lo que ocurra primero). Un hilo de fondo revisa
+    el intervalo, así una ráfaga no queda sin fsync si dejan de llegar
+    escrituras.
+
+    El índice en memoria guarda invoice_id -> (segmento, offset, largo) y las
+    lecturas devuelven un memoryview sobre el segmento mapeado (sin copias).
+    Al abrir se reconstruye el índice y se descarta una cola incompleta.
+    """
+
+    def __init__(
+        self,
+        base_dir: Union[str, Path],
+        segment_bytes: int = 64 * 1024 * 1024,
+        sync_every: int = 256,
+        sync_interval: float = 0.05,
+    ) -> None:
+        self._dir = Path(base_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = segment_bytes
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._index: dict[str, tuple[int, int, int]] = {}
+        self._maps: dict[int, mmap.mmap] = {}
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.syncs = 0
+
+        segments = sorted(int(p.stem.split("-")[1]) for p in self._dir.glob("segment-*.log"))
+        for number in segments:
+            self._recover(number)
+        self._active = segments[-1] if segments else 1
+        self._file = open(self._segment_path(self._active), "ab")
+        self._offset = self._file.tell()
+        self._closed = threading.Event()
+        self._syncer = threading.Thread(target=self._sync_periodically, name="segment-log-sync", daemon=True)
+        self._syncer.start()
+
+    def _segment_path(self, number: int) -> Path:
+        return self._dir / f"segment-{number:06d}.log"
+
+    def _recover(self, number: int) -> None:
+        path = self._segment_path(number)
+        data = path.read_bytes()
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            magic, meta_len, doc_len, crc = _HEADER.unpack_from(data, offset)
+            end = offset + _HEADER.size + meta_len + doc_len
+            body = data[offset + _HEADER.size:end]
+            if magic != _MAGIC or end > len(data) or zlib.crc32(body) != crc:
+                break
+            invoice_id = json.loads(body[:meta_len])["invoice_id"]
+            self._index[invoice_id] = (number, offset, end - offset)
+            offset = end
+        if offset < len(data):
+            # Cola escrita a medias (caída antes del fsync): se descarta
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+
+    # Escritura
+
+    def save(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        meta = json.dumps(
+            {
+                "invoice_id": invoice.invoice_id,
+                "customer_email": invoice.customer_email,
+                "customer_name": invoice.customer_name,
+                "amount": invoice.amount,
+                "issued_date": invoice.issued_date.isoformat(),
+                "filename": document.filename,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        content = document.content_bytes
+        crc = zlib.crc32(content, zlib.crc32(meta))
+        header = _HEADER.pack(_MAGIC, len(meta), len(content), crc)
+        length = len(header) + len(meta) + len(content)
+
+        with self._lock:
+            if self._offset and self._offset + length > self._segment_bytes:
+                self._rotate()
+            self._file.write(header)
+            self._file.write(meta)
+            self._file.write(content)
+            self._index[invoice.invoice_id] = (self._active, self._offset, length)
+            self._offset += length
+            self._unsynced += 1
+            if (
+                self._unsynced >= self._sync_every
+                or time.monotonic() - self._last_sync >= self._sync_interval
+            ):
+                self._sync()
+
+    def _sync(self) -> None:
+        # Group commit: un fsync cubre todos los registros pendientes
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.syncs += 1
+
+    def _sync_periodically(self) -> None:
+        while not self._closed.wait(self._sync_interval):
+            with self._lock:
+                if self._unsynced and time.monotonic() - self._last_sync >= self._sync_interval:
+                    self._sync()
+
+    def _rotate(self) -> None:
+        self._sync()
+        self._file.close()
+        self._active += 1
+        self._file = open(self._segment_path(self._active), "ab")
+        self._offset = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._syncer.join()
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+            self._maps.clear()
+
+    # Lectura
+
+    def _record(self, invoice_id: str) -> Optional[memoryview]:
+        with self._lock:
+            location = self._index.get(invoice_id)
+            if location is None:
+                return None
+            segment, offset, length = location
+            mapped = self._maps.get(segment)
+            if mapped is None or offset + length > len(mapped):
+                if segment == self._active:
+                    self._file.flush()
+                with open(self._segment_path(segment), "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                # Un mapa anterior sigue vivo mientras existan vistas sobre él
+                self._maps[segment] = mapped
+        return memoryview(mapped)[offset:offset + length]
+
+    def read_document(self, invoice_id: str) -> Optional[memoryview]:
+        """Bytes del documento como vista sobre el segmento (sin copia)."""
+        record = self._record(invoice_id)
+        if record is None:
+            return None
+        _, meta_len, _, _ = _HEADER.unpack_from(record)
+        return record[_HEADER.size + meta_len:]
+
+    def load(self, invoice_id: str) -> Optional[tuple[Invoice, GeneratedDocument]]:
+        record = self._record(invoice_id)
+        if record is None:
+            return None
+        _, meta_len, _, _ = _HEADER.unpack_from(record)
+        meta = json.loads(bytes(record[_HEADER.size:_HEADER.size + meta_len]))
+        invoice = Invoice(
+            invoice_id=meta["invoice_id"],
+            customer_email=meta["customer_email"],
+            customer_name=meta["customer_name"],
+            amount=meta["amount"],
+            issued_date=date.fromisoformat(meta["issued_date"]),
+        )
+        document = GeneratedDocument(
+            filename=meta["filename"],
+            content_bytes=record[_HEADER.size + meta_len:],
+        )
+        return invoice, document
+
+    def __len__(self) -> int:
+        return len(self._index)
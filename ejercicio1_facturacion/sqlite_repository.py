@@ -0,0 +1,170 @@
+# sqlite_repository.py
+# Repositorio en base de datos embebida (sqlite3 de la librería estándar)
+from __future__ import annotations
+import hashlib
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Optional, Union
+
+from billing_components import GeneratedDocument, Invoice, InvoiceRepository
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoices (
+    invoice_id     TEXT PRIMARY KEY,
+    customer_email TEXT NOT NULL,
+    customer_name  TEXT NOT NULL,
+    amount         REAL NOT NULL,
+    issued_date    TEXT NOT NULL,
+    filename       TEXT NOT NULL,
+    document       BLOB,
+    document_path  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_invoices_customer ON invoices (customer_email, issued_date);
+CREATE INDEX IF NOT EXISTS idx_invoices_issued_date ON invoices (issued_date);
+"""
+
+_INSERT = (
+    "INSERT OR REPLACE INTO invoices "
+    "(invoice_id, customer_email, customer_name, amount, issued_date, filename, document, document_path) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_COLUMNS = "invoice_id, customer_email, customer_name, amount, issued_date"
+
+
+class SqliteInvoiceRepository(InvoiceRepository):
+    """
+    Guarda facturas en SQLite (modo WAL) acumulando filas y escribiéndolas con
+    `executemany` en una sola transacción cuando el lote llega a `batch_size`
+    o pasan `flush_interval` segundos. Un hilo de fondo revisa el intervalo,
+    así lo pendiente se escribe aunque dejen de llegar facturas.
+
+    Documentos mayores a `blob_threshold` bytes se escriben fuera de línea
+    (en `<db>.documents/`) y la tabla guarda solo la ruta. El archivo se
+    nombra con el SHA-256 del id de factura, no con `document.filename`: un
+    nombre con `../` o separadores no puede escribir fuera del directorio ni
+    pisar el documento de otra factura.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 1000,
+        flush_interval: float = 0.5,
+        blob_threshold: int = 256 * 1024,
+    ) -> None:
+        self._path = Path(path)
+        self._documents_dir = self._path.with_name(self._path.name + ".documents")
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._blob_threshold = blob_threshold
+        self._pending: list[tuple] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="sqlite-flush", daemon=True)
+        self._flusher.start()
+
+    def save(self, invoice: Invoice, document: GeneratedDocument) -> None:
+        content = document.content_bytes
+        if len(content) > self._blob_threshold:
+            self._documents_dir.mkdir(exist_ok=True)
+            document_path = self._documents_dir / hashlib.sha256(invoice.invoice_id.encode()).hexdigest()
+            document_path.write_bytes(content)
+            blob, path = None, str(document_path)
+        else:
+            blob, path = bytes(content), None
+        row = (
+            invoice.invoice_id,
+            invoice.customer_email,
+            invoice.customer_name,
+            invoice.amount,
+            invoice.issued_date.isoformat(),
+            document.filename,
+            blob,
+            path,
+        )
+        with self._lock:
+            self._pending.append(row)
+            if (
+                len(self._pending) >= self._batch_size
+                or time.monotonic() - self._last_flush >= self._flush_interval
+            ):
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(_INSERT, self._pending)
+            self._pending.clear()
+        self._last_flush = time.monotonic()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self._flush_interval):
+            with self._lock:
+                if self._pending and time.monotonic() - self._last_flush >= self._flush_interval:
+                    self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._flusher.join()
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    # Consultas (ven también lo pendiente de escribir)
+
+    def _query(self, sql: str, params: tuple) -> list:
+        with self._lock:
+            self._flush()
+            return self._conn.execute(sql, params).fetchall()
+
+    def get(self, invoice_id: str) -> Optional[tuple[Invoice, GeneratedDocument]]:
+        rows = self._query(
+            f"SELECT {_COLUMNS}, filename, document, document_path FROM invoices WHERE invoice_id = ?",
+            (invoice_id,),
+        )
+        if not rows:
+            return None
+        *columns, filename, blob, path = rows[0]
+        content = blob if path is None else Path(path).read_bytes()
+        return _invoice(columns), GeneratedDocument(filename=filename, content_bytes=content)
+
+    def find_by_customer(self, customer_email: str) -> list[Invoice]:
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM invoices WHERE customer_email = ? ORDER BY issued_date",
+            (customer_email,),
+        )
+        return [_invoice(row) for row in rows]
+
+    def find_by_date_range(self, start: date, end: date) -> list[Invoice]:
+        """Facturas con start <= issued_date <= end."""
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM invoices WHERE issued_date BETWEEN ? AND ? ORDER BY issued_date",
+            (start.isoformat(), end.isoformat()),
+        )
+        return [_invoice(row) for row in rows]
+
+
+def _invoice(row) -> Invoice:
+    invoice_id, customer_email, customer_name, amount, issued_date = row
+    return Invoice(
+        invoice_id=invoice_id,
+        customer_email=customer_email,
+        customer_name=customer_name,
+        amount=amount,
+        issued_date=date.fromisoformat(issued_date),
+    )
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Deque, Dict, Union
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Límite de pagos simultáneos que se ajusta solo (AIMD guiado por latencia,
+    al estilo TCP Vegas).
+
+    - Se recuerda la menor latencia observada como referencia (sin cola).
+    - Si una respuesta tarda <= referencia * `tolerance`, el límite crece en
+      1/límite (≈ +1 por cada "ronda" de pagos): aumento aditivo.
+    - Si tarda más o falla, la pasarela se está saturando: el límite se
+      multiplica por `backoff` (disminución multiplicativa).
+
+    Sirve para hilos (acquire/release) y para asyncio (acquire_async/release):
+    quien espera se despierta en orden de llegada al liberarse un lugar.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        minimum: float = 1,
+        maximum: float = 256,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+    ):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.baseline = None
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Union[threading.Event, asyncio.Future]] = deque()
+
+    def _try_enter(self) -> bool:
+        # Se llama con el lock tomado
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._try_enter():
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_enter():
+                return
+            future = loop.create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                    raise
+            # El lugar ya había sido asignado: se devuelve
+            self.release(None, error=False)
+            raise
+
+    def release(self, latency: float = None, error: bool = False) -> None:
+        """Libera el lugar y ajusta el límite con la latencia observada (si la hay)."""
+        with self._lock:
+            if error:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+            elif latency is not None:
+                if self.baseline is None or latency < self.baseline:
+                    self.baseline = latency
+                if latency <= self.baseline * self.tolerance:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                else:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self) -> None:
+        # Se llama con el lock tomado: pasa lugares libres a quienes esperan
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            self.in_flight += 1
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "baseline_latency": self.baseline or 0.0,
+            }
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
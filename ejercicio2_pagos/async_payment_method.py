@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any
+
+
+class AsyncPaymentMethod(ABC):
+    """
+    Variante asíncrona de PaymentMethod para pasarelas de red.
+    Mismo contrato, pero pay() es una corrutina: muchos pagos pueden estar
+    en vuelo a la vez sin bloquear el event loop.
+    """
+
+    @abstractmethod
+    def validate(self) -> bool:
+        """Valida que el método de pago esté correctamente configurado."""
+        pass
+
+    @abstractmethod
+    async def pay(self, amount: float) -> bool:
+        """Procesa el pago. Retorna True si fue exitoso, False en caso contrario."""
+        pass
+
+    @abstractmethod
+    def get_payment_info(self) -> Dict[str, Any]:
+        """Retorna información sobre el método de pago."""
+        pass
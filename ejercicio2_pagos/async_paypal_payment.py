@@ -0,0 +1,37 @@
+from async_payment_method import AsyncPaymentMethod
+from gateway_session_pool import GatewaySessionPool
+from typing import Dict, Any
+
+
+class AsyncPayPalPayment(AsyncPaymentMethod):
+    """
+    Pago con PayPal asíncrono.
+    Usa un GatewaySessionPool compartido: la conexión con PayPal se establece
+    una vez por sesión del pool y no en cada pago.
+    """
+
+    def __init__(self, pool: GatewaySessionPool, email: str = "usuario@example.com"):
+        self.pool = pool
+        self.email = email
+
+    def validate(self) -> bool:
+        """Valida que el email de PayPal sea válido."""
+        return "@" in self.email and "." in self.email
+
+    async def pay(self, amount: float) -> bool:
+        """Procesa el pago con PayPal a través de una sesión del pool."""
+        if not self.validate() or amount <= 0:
+            return False
+        try:
+            async with self.pool.session() as session:
+                reply = await session.request(f"PAY {self.email} {amount:.2f}")
+        except (ConnectionError, OSError):
+            return False
+        return reply.startswith("OK")
+
+    def get_payment_info(self) -> Dict[str, Any]:
+        return {
+            "metodo": "PayPal",
+            "email": self.email,
+            "estado": "Conectado" if self.pool.stats()["idle"] else "Desconectado"
+        }
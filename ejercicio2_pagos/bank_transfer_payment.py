@@ -1,5 +1,6 @@
-from payment_method import PaymentMethod
-from typing import Dict, Any
+from payment_method import PaymentMethod, report
+from settlement_queue import SettlementQueue
+from typing import Any, Callable, Dict, Optional
 
 
 class BankTransferPayment(PaymentMethod):
@@ -8,9 +9,21 @@ class BankTransferPayment(PaymentMethod):
     Aplica Liskov Substitution: es intercambiable con otros PaymentMethod.
     """
 
-    def __init__(self, account_number: str = "****-****-1234", bank_name: str = "Banco Nacional"):
+    max_amount = 10000
+
+    def __init__(
+        self,
+        account_number: str = "****-****-1234",
+        bank_name: str = "Banco Nacional",
+        settlement_queue: Optional[SettlementQueue] = None,
+        on_enqueued: Optional[Callable[[str, float], None]] = None,
+    ):
         self.account_number = account_number
         self.bank_name = bank_name
+        self.settlement_queue = settlement_queue
+        # Recibe (transfer_id, monto) de cada transferencia encolada, para conciliarla después
+        self.on_enqueued = on_enqueued
+        self.last_transfer_id: Optional[str] = None
 
     def validate(self) -> bool:
         """Valida que la cuenta bancaria sea válida."""
@@ -19,22 +32,28 @@ class BankTransferPayment(PaymentMethod):
     def pay(self, amount: float) -> bool:
         """Procesa el pago por transferencia bancaria."""
         if not self.validate():
-            print(f"❌ Error: Datos bancarios inválidos")
+            report(f"❌ Error: Datos bancarios inválidos")
             return False
         
         if amount <= 0:
-            print(f"❌ Error: El monto debe ser mayor a $0")
+            report(f"❌ Error: El monto debe ser mayor a $0")
             return False
         
-        if amount > 10000:
-            print(f"❌ Error: Límite de transferencia excedido (máximo: $10000)")
+        if amount > self.max_amount:
+            report(f"❌ Error: Límite de transferencia excedido (máximo: ${self.max_amount})")
             return False
         
-        print(f"🏦 Procesando transferencia bancaria de ${amount:.2f}")
-        print(f"   Banco: {self.bank_name}")
-        print(f"   Cuenta: {self.account_number}")
-        print(f"   Tiempo estimado: 1-3 días hábiles")
-        print(f"✅ Transferencia iniciada correctamente")
+        report(f"🏦 Procesando transferencia bancaria de ${amount:.2f}")
+        report(f"   Banco: {self.bank_name}")
+        report(f"   Cuenta: {self.account_number}")
+        report(f"   Tiempo estimado: 1-3 días hábiles")
+        if self.settlement_queue is not None:
+            transfer_id = self.settlement_queue.enqueue(self.account_number, self.bank_name, amount)
+            self.last_transfer_id = transfer_id
+            if self.on_enqueued is not None:
+                self.on_enqueued(transfer_id, amount)
+            report(f"   ⏳ {transfer_id} en cola para la próxima liquidación")
+        report(f"✅ Transferencia iniciada correctamente")
         return True
 
     def get_payment_info(self) -> Dict[str, Any]:
@@ -0,0 +1,65 @@
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+
+class BatchResult:
+    """
+    Resultado compacto de un lote de pagos.
+    En vez de un dict por pago guarda columnas: índice del método (sobre una
+    tabla de nombres), monto y éxito, en arrays del módulo `array`.
+    """
+
+    def __init__(self, size: int = 0):
+        self.method_names: List[str] = []
+        self._method_ids: Dict[str, int] = {}
+        self.method_index = array("H", bytes(2 * size))
+        self.amounts = array("d", bytes(8 * size))
+        self.successes = array("b", bytes(size))
+
+    def method_id(self, name: str) -> int:
+        """Registra (una vez) el nombre del método y retorna su índice."""
+        if name not in self._method_ids:
+            self._method_ids[name] = len(self.method_names)
+            self.method_names.append(name)
+        return self._method_ids[name]
+
+    def set(self, position: int, method_id: int, amount: float, success: bool) -> None:
+        self.method_index[position] = method_id
+        self.amounts[position] = amount
+        self.successes[position] = success
+
+    def __len__(self) -> int:
+        return len(self.successes)
+
+    def __getitem__(self, position: int) -> Tuple[str, float, bool]:
+        return (
+            self.method_names[self.method_index[position]],
+            self.amounts[position],
+            bool(self.successes[position]),
+        )
+
+    def __iter__(self) -> Iterator[Tuple[str, float, bool]]:
+        for position in range(len(self)):
+            yield self[position]
+
+    @property
+    def succeeded(self) -> int:
+        return sum(self.successes)
+
+    @property
+    def failed(self) -> int:
+        return len(self) - self.succeeded
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Totales por método: pagos exitosos, fallidos y monto cobrado."""
+        totals = {
+            name: {"exitosos": 0, "fallidos": 0, "monto": 0.0} for name in self.method_names
+        }
+        for method_id, amount, success in zip(self.method_index, self.amounts, self.successes):
+            entry = totals[self.method_names[method_id]]
+            if success:
+                entry["exitosos"] += 1
+                entry["monto"] += amount
+            else:
+                entry["fallidos"] += 1
+        return totals
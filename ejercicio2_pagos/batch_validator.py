@@ -0,0 +1,103 @@
+from array import array
+from operator import itemgetter
+from typing import Dict, List, Sequence, Tuple
+
+from payment_method import PaymentMethod
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: se usa el camino en Python puro
+    np = None
+
+
+# Códigos de motivo de rechazo
+ACCEPTED = 0
+INVALID_CREDENTIALS = 1
+NON_POSITIVE_AMOUNT = 2
+LIMIT_EXCEEDED = 3
+
+REASONS = {
+    ACCEPTED: "ACEPTADO",
+    INVALID_CREDENTIALS: "CREDENCIALES_INVALIDAS",
+    NON_POSITIVE_AMOUNT: "MONTO_NO_POSITIVO",
+    LIMIT_EXCEEDED: "LIMITE_EXCEDIDO",
+}
+
+
+class ValidationResult:
+    """Un código de motivo por pago (0 = aceptado), en un array compacto."""
+
+    def __init__(self, codes: array):
+        self.codes = codes
+
+    def accepted(self) -> List[int]:
+        return [position for position, code in enumerate(self.codes) if code == ACCEPTED]
+
+    def rejected(self) -> List[Tuple[int, str]]:
+        return [(position, REASONS[code]) for position, code in enumerate(self.codes) if code != ACCEPTED]
+
+    def counts(self) -> Dict[str, int]:
+        totals = dict.fromkeys(REASONS.values(), 0)
+        for code in self.codes:
+            totals[REASONS[code]] += 1
+        return totals
+
+
+class BatchValidator:
+    """
+    Pre-validación por columnas de un lote (método, monto, ...) antes de
+    llamar a cualquier pasarela: dice qué pagos se rechazarían y por qué
+    (un código de motivo por pago), para informarlo o separar el lote.
+
+    - Credenciales: validate() se ejecuta una sola vez por instancia de método.
+    - Montos y límites (PaymentMethod.max_amount): se evalúan sobre arrays
+      completos con NumPy si está instalado, o con un bucle en Python puro.
+    Se respeta el mismo orden de chequeos que pay(): credenciales, monto > 0, límite.
+
+    No es una optimización: pay() repite sus propios chequeos en los pagos
+    aceptados, así que el costo de validar se suma al del lote.
+    """
+
+    def __init__(self, use_numpy: bool = True):
+        self.use_numpy = use_numpy and np is not None
+
+    def validate(self, payments: Sequence[Tuple]) -> ValidationResult:
+        payment_methods = list(map(itemgetter(0), payments))
+        amounts = array("d", map(itemgetter(1), payments))
+        positions: Dict[int, int] = {}
+        method_index = array("l", [positions.setdefault(id(m), len(positions)) for m in payment_methods])
+        methods: List[PaymentMethod] = list({id(m): m for m in payment_methods}.values())
+
+        credentials_ok = [method.validate() for method in methods]
+        limits = [float("inf") if m.max_amount is None else float(m.max_amount) for m in methods]
+
+        if self.use_numpy:
+            return ValidationResult(self._codes_numpy(method_index, amounts, credentials_ok, limits))
+        return ValidationResult(self._codes_python(method_index, amounts, credentials_ok, limits))
+
+    @staticmethod
+    def _codes_numpy(method_index, amounts, credentials_ok, limits) -> array:
+        index = np.frombuffer(method_index, dtype=f"i{method_index.itemsize}")
+        values = np.frombuffer(amounts, dtype=np.float64)
+        codes = np.select(
+            [
+                ~np.asarray(credentials_ok, dtype=bool)[index],
+                values <= 0,
+                values > np.asarray(limits, dtype=np.float64)[index],
+            ],
+            [INVALID_CREDENTIALS, NON_POSITIVE_AMOUNT, LIMIT_EXCEEDED],
+            default=ACCEPTED,
+        ).astype(np.int8)
+        return array("b", codes.tobytes())
+
+    @staticmethod
+    def _codes_python(method_index, amounts, credentials_ok, limits) -> array:
+        codes = array("b", bytes(len(amounts)))
+        for position, (method, amount) in enumerate(zip(method_index, amounts)):
+            if not credentials_ok[method]:
+                codes[position] = INVALID_CREDENTIALS
+            elif amount <= 0:
+                codes[position] = NON_POSITIVE_AMOUNT
+            elif amount > limits[method]:
+                codes[position] = LIMIT_EXCEEDED
+        return codes
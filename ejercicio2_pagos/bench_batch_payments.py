@@ -0,0 +1,54 @@
+"""
+Benchmark: bucle de process_payment vs process_batch con 100k pagos.
+"""
+import argparse
+import os
+import random
+import time
+from contextlib import redirect_stdout
+
+from bank_transfer_payment import BankTransferPayment
+from credit_card_payment import CreditCardPayment
+from crypto_payment import CryptoPayment
+from payment_processor import PaymentProcessor
+
+
+def build_payments(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    methods = [CreditCardPayment(), BankTransferPayment(), CryptoPayment()]
+    return [
+        (rng.choice(methods), round(rng.uniform(-10, 20000), 2), f"Pago {n}")
+        for n in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    payments = build_payments(args.count)
+
+    # Bucle actual: imprime banners (redirigidos a /dev/null para no medir la terminal)
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        processor = PaymentProcessor(payments[0][0])
+        start = time.perf_counter()
+        for method, amount, description in payments:
+            processor.payment_method = method
+            processor.process_payment(amount, description)
+        loop_elapsed = time.perf_counter() - start
+
+    processor = PaymentProcessor(payments[0][0], verbose=False)
+    start = time.perf_counter()
+    result = processor.process_batch(payments, concurrency=args.concurrency)
+    batch_elapsed = time.perf_counter() - start
+
+    print(f"{args.count:,} pagos")
+    print(f"process_payment (bucle)  {loop_elapsed:6.2f}s  {args.count / loop_elapsed:>10,.0f} pagos/s")
+    print(f"process_batch            {batch_elapsed:6.2f}s  {args.count / batch_elapsed:>10,.0f} pagos/s")
+    print(f"speedup x{loop_elapsed / batch_elapsed:.2f}  ({result.succeeded:,} exitosos, {result.failed:,} fallidos)")
+
+
+if __name__ == "__main__":
+    main()
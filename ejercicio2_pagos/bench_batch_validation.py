@@ -0,0 +1,64 @@
+"""
+Benchmark: costo de la pre-validación por columnas (NumPy / Python puro).
+
+pay() repite sus chequeos en los pagos aceptados, así que este costo se suma
+al del lote; se compara contra el chequeo por objeto sólo como referencia.
+"""
+import argparse
+import random
+import time
+
+from bank_transfer_payment import BankTransferPayment
+from batch_validator import BatchValidator, np
+from credit_card_payment import CreditCardPayment
+from crypto_payment import CryptoPayment
+from paypal_payment import PayPalPayment
+
+
+def build_payments(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    methods = [
+        CreditCardPayment(), CreditCardPayment(card_number="123"),
+        PayPalPayment(), BankTransferPayment(), CryptoPayment(),
+    ]
+    return [(rng.choice(methods), round(rng.uniform(-100, 60000), 2), f"Pago {n}") for n in range(count)]
+
+
+def per_object(payments):
+    """Lo que hace hoy cada pay(): validate() y chequeos de monto uno por uno."""
+    accepted = 0
+    for method, amount, _ in payments:
+        if method.validate() and amount > 0 and (method.max_amount is None or amount <= method.max_amount):
+            accepted += 1
+    return accepted
+
+
+def timed(label: str, count: int, fn, reference: float = 0.0):
+    start = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - start
+    extra = f"  (+{elapsed / reference:.0%} del chequeo en pay())" if reference else ""
+    print(f"{label:<30} {elapsed:6.3f}s  {count / elapsed:>12,.0f} pagos/s{extra}")
+    return value, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    payments = build_payments(args.count)
+    print(f"{args.count:,} pagos (NumPy {'disponible' if np is not None else 'no disponible'})")
+    expected, reference = timed("chequeo en pay() (referencia)", args.count, lambda: per_object(payments))
+    python, _ = timed(
+        "columnas (Python puro)", args.count, lambda: BatchValidator(use_numpy=False).validate(payments), reference
+    )
+    assert len(python.accepted()) == expected
+    if np is not None:
+        vectorized, _ = timed("columnas (NumPy)", args.count, lambda: BatchValidator().validate(payments), reference)
+        assert vectorized.codes == python.codes
+    print(python.counts())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark de la capa de idempotencia: latencia de aciertos y memoria por clave.
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from credit_card_payment import CreditCardPayment
+from idempotency_store import IdempotencyStore
+from idempotent_payment_processor import IdempotentPaymentProcessor
+from payment_processor import PaymentProcessor
+
+
+def latency(label: str, count: int, fn) -> None:
+    start = time.perf_counter()
+    for n in range(count):
+        fn(n)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / count * 1e6:8.2f} µs/op")
+
+
+def memory_per_entry(keys: int) -> None:
+    store = IdempotencyStore(max_entries=keys)
+    gc.collect()
+    tracemalloc.start()
+    for n in range(keys):
+        # Sólo la capa en memoria: es la que crece con el número de claves
+        store._remember(f"order-{n:012d}", 1.0, 10.0)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_entry = current / keys
+    print(f"memoria en LRU ({keys:,} claves)  {per_entry:8.1f} bytes/clave")
+    print(f"estimado para 10M claves       {per_entry * 10_000_000 / 2**30:8.2f} GiB")
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--keys", type=int, default=1_000_000, help="usar 10_000_000 para la medición completa")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = IdempotencyStore(os.path.join(tmp, "idempotency.db"), max_entries=args.count)
+        processor = IdempotentPaymentProcessor(PaymentProcessor(CreditCardPayment(), verbose=False), store)
+
+        latency("primer pago (miss + pay)", args.count, lambda n: processor.process_payment(f"k{n}", 10.0))
+        latency("reintento (hit en memoria)", args.count, lambda n: processor.process_payment(f"k{n}", 10.0))
+        store._memory.clear()
+        latency("reintento (hit en disco)", args.count, lambda n: processor.process_payment(f"k{n}", 10.0))
+        print(f"ejecutados={processor.executed:,} reutilizados={processor.replayed:,}")
+        store.close()
+
+    memory_per_entry(args.keys)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Suite de benchmarks de la plataforma de pagos.
+
+Ejecuta cargas sintéticas (mezcla de métodos, tasa de fallos y latencia de
+pasarela inyectada) contra PaymentProcessor y contra cada PaymentMethod, y
+reporta throughput, percentiles de latencia, asignaciones (tracemalloc) y
+el RSS pico del proceso (ru_maxrss: acumulado desde el arranque, así que no
+se puede atribuir a una carga en particular). Los resultados se guardan en JSON para comparar versiones:
+
+    python bench_payments.py --output base.json
+    python bench_payments.py --compare base.json   # falla si hay regresiones
+"""
+import argparse
+import json
+import platform
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+from bank_transfer_payment import BankTransferPayment
+from credit_card_payment import CreditCardPayment
+from crypto_payment import CryptoPayment
+from payment_method import PaymentMethod, quiet
+from payment_processor import PaymentProcessor
+from paypal_payment import PayPalPayment
+
+
+# Pasarela simulada
+
+class SimulatedGatewayPayment(PaymentMethod):
+    """Envuelve un método real agregando latencia y fallos de pasarela, y mide cada pago."""
+
+    def __init__(self, method: PaymentMethod, latency: float, failure_rate: float, seed: int):
+        self.method = method
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.max_amount = method.max_amount
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.samples: List[float] = []
+
+    def validate(self) -> bool:
+        return self.method.validate()
+
+    def pay(self, amount: float) -> bool:
+        start = time.perf_counter()
+        with self._lock:
+            fail = self._rng.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        success = not fail and self.method.pay(amount)
+        self.samples.append(time.perf_counter() - start)
+        return success
+
+    def get_payment_info(self) -> Dict:
+        return self.method.get_payment_info()
+
+
+# Cargas
+
+@dataclass
+class Workload:
+    name: str
+    count: int
+    mix: Dict[str, float]
+    failure_rate: float = 0.0
+    latency: float = 0.0
+
+
+WORKLOADS = [
+    Workload("tarjeta_sin_latencia", 20_000, {"tarjeta": 1.0}),
+    Workload("mixto_sin_latencia", 20_000, {"tarjeta": 0.5, "paypal": 0.2, "banco": 0.2, "cripto": 0.1}),
+    Workload("mixto_fallos_10pct", 20_000, {"tarjeta": 0.5, "paypal": 0.2, "banco": 0.2, "cripto": 0.1}, failure_rate=0.1),
+    Workload("mixto_latencia_1ms", 1_000, {"tarjeta": 0.5, "paypal": 0.2, "banco": 0.2, "cripto": 0.1}, latency=0.001),
+]
+
+FACTORIES = {
+    "tarjeta": CreditCardPayment,
+    "paypal": PayPalPayment,
+    "banco": BankTransferPayment,
+    "cripto": CryptoPayment,
+}
+
+
+def build(workload: Workload, seed: int = 1):
+    rng = random.Random(seed)
+    methods = {
+        name: SimulatedGatewayPayment(FACTORIES[name](), workload.latency, workload.failure_rate, seed + n)
+        for n, name in enumerate(workload.mix)
+    }
+    names, weights = zip(*workload.mix.items())
+    picks = rng.choices(names, weights, k=workload.count)
+    payments = [(methods[name], round(rng.uniform(1, 12000), 2), f"Pago {n}") for n, name in enumerate(picks)]
+    return methods, payments
+
+
+# Drivers
+
+def drive_loop(payments) -> None:
+    processor = PaymentProcessor(payments[0][0], verbose=False)
+    for method, amount, description in payments:
+        processor.payment_method = method
+        processor.process_payment(amount, description)
+
+
+def drive_batch(payments) -> None:
+    PaymentProcessor(payments[0][0], verbose=False).process_batch(payments, concurrency=8)
+
+
+def drive_direct(payments) -> None:
+    with quiet():
+        for method, amount, _ in payments:
+            method.pay(amount)
+
+
+DRIVERS = {"process_payment": drive_loop, "process_batch": drive_batch, "pay_directo": drive_direct}
+
+
+@dataclass
+class Result:
+    workload: str
+    driver: str
+    count: int
+    seconds: float
+    throughput: float
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    alloc_peak_kib: float = 0.0
+    alloc_net_kib: float = 0.0
+    process_rss_peak_mib: float = 0.0
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if len(samples) < 2:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+def run(workload: Workload, driver_name: str, trace_allocations: bool, repeat: int = 3) -> Result:
+    driver = DRIVERS[driver_name]
+    # Se queda con la corrida más rápida: las demás suelen medir ruido de la máquina
+    seconds, samples = float("inf"), []
+    for _ in range(repeat):
+        methods, payments = build(workload)
+        start = time.perf_counter()
+        driver(payments)
+        elapsed = time.perf_counter() - start
+        if elapsed < seconds:
+            seconds = elapsed
+            samples = [sample for method in methods.values() for sample in method.samples]
+
+    result = Result(
+        workload=workload.name,
+        driver=driver_name,
+        count=workload.count,
+        seconds=seconds,
+        throughput=workload.count / seconds,
+        latency_ms=percentiles(samples),
+    )
+    if trace_allocations:
+        # Pasada aparte: tracemalloc distorsiona los tiempos
+        _, payments = build(workload)
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        driver(payments)
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result.alloc_peak_kib = peak / 1024
+        result.alloc_net_kib = (after - before) / 1024
+    # Pico de TODO el proceso hasta ahora (no de esta carga); KiB en Linux, bytes en macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result.process_rss_peak_mib = rss / (2**20 if sys.platform == "darwin" else 1024)
+    return result
+
+
+def compare(results: List[Result], baseline_path: str, tolerance: float) -> int:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["workload"], r["driver"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nComparación contra {baseline_path} (tolerancia {tolerance:.0%})")
+    for result in results:
+        old = baseline.get((result.workload, result.driver))
+        if old is None:
+            continue
+        change = result.throughput / old["throughput"] - 1
+        flag = ""
+        if change < -tolerance:
+            flag = "  <-- REGRESIÓN"
+            regressions += 1
+        print(f"{result.workload:<24} {result.driver:<16} {change:+7.1%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="guardar resultados en este JSON")
+    parser.add_argument("--compare", help="JSON de una corrida anterior")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="caída de throughput tolerada")
+    parser.add_argument("--workloads", nargs="+", choices=[w.name for w in WORKLOADS])
+    parser.add_argument("--drivers", nargs="+", choices=list(DRIVERS), default=list(DRIVERS))
+    parser.add_argument("--no-alloc", action="store_true", help="no medir asignaciones")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplica la cantidad de pagos")
+    parser.add_argument("--repeat", type=int, default=3, help="corridas por carga (se toma la mejor)")
+    args = parser.parse_args()
+
+    results = []
+    for workload in WORKLOADS:
+        if args.workloads and workload.name not in args.workloads:
+            continue
+        workload = Workload(**{**asdict(workload), "count": max(1, int(workload.count * args.scale))})
+        for driver_name in args.drivers:
+            result = run(workload, driver_name, trace_allocations=not args.no_alloc, repeat=max(1, args.repeat))
+            results.append(result)
+            latency = result.latency_ms
+            print(
+                f"{result.workload:<24} {result.driver:<16} {result.throughput:>10,.0f} pagos/s  "
+                f"p50={latency['p50']:.3f}ms p95={latency['p95']:.3f}ms p99={latency['p99']:.3f}ms  "
+                f"alloc_pico={result.alloc_peak_kib:,.0f}KiB rss_pico_proceso={result.process_rss_peak_mib:.0f}MiB"
+            )
+
+    if args.output:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": [asdict(result) for result in results],
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Benchmark: AsyncPayPalPayment contra FakeGatewayServer, con y sin pool de sesiones.
+"""
+import argparse
+import asyncio
+import time
+
+from async_paypal_payment import AsyncPayPalPayment
+from fake_gateway_server import FakeGatewayServer
+from gateway_session_pool import GatewaySessionPool
+
+
+async def run(count: int, pool_size: int, keepalive: bool, handshake: float, latency: float) -> None:
+    async with FakeGatewayServer(handshake_latency=handshake, request_latency=latency) as gateway:
+        pool = GatewaySessionPool(gateway.host, gateway.port, size=pool_size, keepalive=keepalive)
+        paypal = AsyncPayPalPayment(pool, email="cliente@gmail.com")
+        start = time.perf_counter()
+        results = await asyncio.gather(*(paypal.pay(10.0 + n % 100) for n in range(count)))
+        elapsed = time.perf_counter() - start
+        await pool.close()
+
+    label = "pool" if keepalive else "sin pool"
+    print(
+        f"{label:<9} size={pool_size:<4} {count / elapsed:>9,.0f} pagos/s  "
+        f"({sum(results)} ok, {gateway.handshakes} handshakes, {elapsed:.2f}s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000)
+    parser.add_argument("--handshake", type=float, default=0.05, help="segundos por handshake")
+    parser.add_argument("--latency", type=float, default=0.005, help="segundos por pago")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        asyncio.run(run(args.count, size, False, args.handshake, args.latency))
+    for size in args.sizes:
+        asyncio.run(run(args.count, size, True, args.handshake, args.latency))
+
+
+if __name__ == "__main__":
+    main()
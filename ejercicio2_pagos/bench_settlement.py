@@ -0,0 +1,69 @@
+"""
+Benchmark de liquidación: encola N transferencias, escribe el archivo de
+liquidación, simula la respuesta del banco y concilia (memoria pico incluida).
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from settlement_queue import SettlementQueue
+from settlement_reconciler import SettlementReconciler
+
+
+def simulate_bank(settlement_path: str, status_path: str, reject_rate: float, missing_rate: float, seed: int = 7):
+    """Genera el archivo de estados del banco recorriendo la liquidación en streaming."""
+    rng = random.Random(seed)
+    with open(settlement_path, newline="", encoding="utf-8") as source, \
+            open(status_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as target:
+        reader = csv.reader(source)
+        next(reader)
+        writer = csv.writer(target)
+        for transfer_id, *_ in reader:
+            roll = rng.random()
+            if roll < missing_rate:
+                continue
+            writer.writerow((transfer_id, "RECHAZADA" if roll < missing_rate + reject_rate else "ACEPTADA"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--partitions", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settlement_path = os.path.join(tmp, "liquidacion.csv")
+        status_path = os.path.join(tmp, "estados.csv")
+
+        queue = SettlementQueue()
+        rng = random.Random(1)
+        for n in range(args.count):
+            queue.enqueue(f"****-****-{n % 10000:04d}", "Banco Nacional", round(rng.uniform(1, 10000), 2))
+
+        start = time.perf_counter()
+        written = queue.write_settlement_file(settlement_path)
+        print(f"liquidación: {written:,} filas escritas en {time.perf_counter() - start:.2f}s")
+
+        simulate_bank(settlement_path, status_path, reject_rate=0.02, missing_rate=0.01)
+
+        reconciler = SettlementReconciler(partitions=args.partitions, workdir=tmp)
+        start = time.perf_counter()
+        report = reconciler.reconcile(settlement_path, status_path)
+        elapsed = time.perf_counter() - start
+
+        # Segunda pasada sólo para medir memoria (tracemalloc la hace más lenta)
+        tracemalloc.start()
+        reconciler.reconcile(settlement_path, status_path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"conciliación: {elapsed:.2f}s ({written / elapsed:,.0f} filas/s), memoria pico {peak / 2**20:.1f} MiB")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+class ChainClient(ABC):
+    """
+    Abstracción de un nodo/API de blockchain.
+    Las confirmaciones se consultan por lotes: una llamada para muchas transacciones.
+    """
+
+    @abstractmethod
+    def submit(self, wallet_address: str, amount: float) -> str:
+        """Publica la transacción y retorna su id."""
+        pass
+
+    @abstractmethod
+    def get_confirmations(self, tx_ids: List[str]) -> Dict[str, int]:
+        """Confirmaciones actuales de cada transacción (0 si aún no está en un bloque)."""
+        pass
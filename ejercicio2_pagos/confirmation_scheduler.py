@@ -0,0 +1,156 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from chain_client import ChainClient
+
+
+Callback = Callable[[str], None]
+
+
+class _Pending:
+    __slots__ = ("tx_id", "deadline", "on_confirmed", "on_timeout")
+
+    def __init__(self, tx_id: str, deadline: float, on_confirmed: Optional[Callback], on_timeout: Optional[Callback]):
+        self.tx_id = tx_id
+        self.deadline = deadline
+        self.on_confirmed = on_confirmed
+        self.on_timeout = on_timeout
+
+
+class ConfirmationScheduler:
+    """
+    Sigue miles de transacciones pendientes sin bloquear a quien paga.
+
+    Un heap ordena las transacciones por su próxima consulta, redondeada a
+    ticks de `poll_interval / 4` (como una rueda de temporizadores) para que
+    las transacciones cercanas venzan juntas. Un hilo de fondo toma todas las
+    que vencieron (hasta `batch_size`), consulta la cadena con UNA sola
+    llamada y dispara `on_confirmed` al llegar a `required_confirmations` u
+    `on_timeout` al superar `timeout`. Las demás se reprograman
+    `poll_interval` segundos más tarde.
+    """
+
+    def __init__(
+        self,
+        client: ChainClient,
+        required_confirmations: int = 3,
+        poll_interval: float = 5.0,
+        timeout: float = 3600.0,
+        batch_size: int = 500,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.required_confirmations = required_confirmations
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._clock = clock
+        self._heap: List[Tuple[float, int, _Pending]] = []
+        self._seq = itertools.count()
+        self._wakeup = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.stats: Dict[str, int] = {"tracked": 0, "confirmed": 0, "timed_out": 0, "polls": 0}
+
+    def _slot(self, moment: float) -> float:
+        tick = self.poll_interval / 4
+        return math.ceil(moment / tick) * tick
+
+    # API
+
+    def submit(
+        self,
+        wallet_address: str,
+        amount: float,
+        on_confirmed: Optional[Callback] = None,
+        on_timeout: Optional[Callback] = None,
+    ) -> str:
+        """Publica la transacción en la cadena y la deja en seguimiento."""
+        tx_id = self.client.submit(wallet_address, amount)
+        self.track(tx_id, on_confirmed, on_timeout)
+        return tx_id
+
+    def track(self, tx_id: str, on_confirmed: Optional[Callback] = None, on_timeout: Optional[Callback] = None) -> None:
+        now = self._clock()
+        pending = _Pending(tx_id, now + self.timeout, on_confirmed, on_timeout)
+        with self._wakeup:
+            heapq.heappush(self._heap, (self._slot(now + self.poll_interval), next(self._seq), pending))
+            self.stats["tracked"] += 1
+            self._wakeup.notify()
+
+    def pending_count(self) -> int:
+        with self._wakeup:
+            return len(self._heap)
+
+    def start(self) -> "ConfirmationScheduler":
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="crypto-confirmations", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._wakeup:
+            self._running = False
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # Ciclo de consulta
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                while self._running:
+                    wait = self._heap[0][0] - self._clock() if self._heap else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._wakeup.wait(wait)
+                if not self._running:
+                    return
+            self.poll_once()
+
+    def poll_once(self) -> int:
+        """Consulta en un solo lote las transacciones vencidas. Retorna cuántas se consultaron."""
+        now = self._clock()
+        due: List[_Pending] = []
+        with self._wakeup:
+            while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+                due.append(heapq.heappop(self._heap)[2])
+        if not due:
+            return 0
+
+        try:
+            confirmations = self.client.get_confirmations([pending.tx_id for pending in due])
+        except Exception:
+            confirmations = {}
+        self.stats["polls"] += 1
+
+        retry = []
+        for pending in due:
+            if confirmations.get(pending.tx_id, 0) >= self.required_confirmations:
+                self.stats["confirmed"] += 1
+                self._fire(pending.on_confirmed, pending.tx_id)
+            elif now >= pending.deadline:
+                self.stats["timed_out"] += 1
+                self._fire(pending.on_timeout, pending.tx_id)
+            else:
+                retry.append(pending)
+
+        next_poll = self._slot(now + self.poll_interval)
+        with self._wakeup:
+            for pending in retry:
+                heapq.heappush(self._heap, (min(next_poll, pending.deadline), next(self._seq), pending))
+        return len(due)
+
+    @staticmethod
+    def _fire(callback: Optional[Callback], tx_id: str) -> None:
+        if callback is not None:
+            try:
+                callback(tx_id)
+            except Exception as error:
+                print(f"⚠️  Error en callback de {tx_id}: {error}")
@@ -1,4 +1,4 @@
-from payment_method import PaymentMethod
+from payment_method import PaymentMethod, report
 from typing import Dict, Any
 
 
@@ -19,16 +19,16 @@ class CreditCardPayment(PaymentMethod):
     def pay(self, amount: float) -> bool:
         """Procesa el pago con tarjeta de crédito."""
         if not self.validate():
-            print(f"❌ Error: Tarjeta de crédito inválida")
+            report(f"❌ Error: Tarjeta de crédito inválida")
             return False
         
         if amount <= 0:
-            print(f"❌ Error: El monto debe ser mayor a $0")
+            report(f"❌ Error: El monto debe ser mayor a $0")
             return False
         
-        print(f"💳 Procesando pago de ${amount:.2f} con tarjeta {self.card_number}")
-        print(f"   Titular: {self.cardholder}")
-        print(f"✅ Pago exitoso con tarjeta de crédito")
+        report(f"💳 Procesando pago de ${amount:.2f} con tarjeta {self.card_number}")
+        report(f"   Titular: {self.cardholder}")
+        report(f"✅ Pago exitoso con tarjeta de crédito")
         return True
 
     def get_payment_info(self) -> Dict[str, Any]:
@@ -1,13 +1,28 @@
-from payment_method import PaymentMethod
-from typing import Dict, Any
+from payment_method import PaymentMethod, report
+from confirmation_scheduler import ConfirmationScheduler
+from typing import Any, Callable, Dict, Optional
 
 
 class CryptoPayment(PaymentMethod):
 
-    def __init__(self, wallet_address: str = "0x1A2B3C4D5E6F...", crypto_type: str = "Bitcoin"):
+    max_amount = 50000
+
+    def __init__(
+        self,
+        wallet_address: str = "0x1A2B3C4D5E6F...",
+        crypto_type: str = "Bitcoin",
+        confirmation_scheduler: Optional[ConfirmationScheduler] = None,
+        on_confirmed: Optional[Callable[[str], None]] = None,
+        on_timeout: Optional[Callable[[str], None]] = None,
+    ):
         self.wallet_address = wallet_address
         self.crypto_type = crypto_type
+        self.confirmation_scheduler = confirmation_scheduler
+        # Avisos al llamador con el tx_id cuando una transacción pendiente se resuelve
+        self.on_confirmed = on_confirmed
+        self.on_timeout = on_timeout
         self.confirmed = False
+        self.pending_transactions = set()
 
     def validate(self) -> bool:
         """Valida que la dirección de billetera sea válida."""
@@ -15,38 +30,72 @@ class CryptoPayment(PaymentMethod):
 
     def _confirm_blockchain(self) -> bool:
         """Simula la confirmación en la blockchain."""
-        print(f"   ⛓️  Confirmando transacción en blockchain...")
+        report(f"   ⛓️  Confirmando transacción en blockchain...")
         self.confirmed = True
         return True
 
+    def _settle(self, tx_id: str, success: bool, on_settled: Optional[Callable[[bool], None]]) -> None:
+        self.pending_transactions.discard(tx_id)
+        if success:
+            self.confirmed = True
+        callback = self.on_confirmed if success else self.on_timeout
+        if callback is not None:
+            callback(tx_id)
+        if on_settled is not None:
+            on_settled(success)
+
     def pay(self, amount: float) -> bool:
-        """Procesa el pago con criptomonedas."""
+        """
+        Procesa el pago con criptomonedas.
+        Con un ConfirmationScheduler el pago queda pendiente y se confirma en
+        segundo plano: True sólo significa que se publicó; el resultado llega
+        por `on_confirmed` / `on_timeout`. Sin él, se confirma en el momento
+        (comportamiento original).
+        """
+        success = self.pay_deferred(amount, None)
+        return True if success is None else success
+
+    def pay_deferred(self, amount: float, on_settled: Optional[Callable[[bool], None]]) -> Optional[bool]:
+        """Como pay(), pero retorna None mientras la transacción espera confirmación."""
         if not self.validate():
-            print(f"❌ Error: Dirección de billetera inválida")
+            report(f"❌ Error: Dirección de billetera inválida")
             return False
-        
+
         if amount <= 0:
-            print(f"❌ Error: El monto debe ser mayor a $0")
+            report(f"❌ Error: El monto debe ser mayor a $0")
             return False
-        
-        if amount > 50000:
-            print(f"❌ Error: Límite de criptopago excedido (máximo: $50000)")
+
+        if amount > self.max_amount:
+            report(f"❌ Error: Límite de criptopago excedido (máximo: ${self.max_amount})")
             return False
-        
-        print(f"₿ Procesando pago de ${amount:.2f} con {self.crypto_type}")
-        print(f"   Billetera: {self.wallet_address}")
-        
+
+        report(f"₿ Procesando pago de ${amount:.2f} con {self.crypto_type}")
+        report(f"   Billetera: {self.wallet_address}")
+
+        if self.confirmation_scheduler is not None:
+            scheduler = self.confirmation_scheduler
+            tx_id = scheduler.client.submit(self.wallet_address, amount)
+            # Se marca pendiente antes de seguirla: la confirmación no puede adelantarse
+            self.pending_transactions.add(tx_id)
+            scheduler.track(
+                tx_id,
+                on_confirmed=lambda tx_id: self._settle(tx_id, True, on_settled),
+                on_timeout=lambda tx_id: self._settle(tx_id, False, on_settled),
+            )
+            report(f"   ⏳ Transacción 0x…{tx_id[-8:]} pendiente de confirmación")
+            return None
+
         if not self._confirm_blockchain():
-            print(f"❌ Error: No se pudo confirmar la transacción en blockchain")
+            report(f"❌ Error: No se pudo confirmar la transacción en blockchain")
             return False
-        
-        print(f"   Confirmaciones: 3/3")
-        print(f"✅ Pago exitoso con {self.crypto_type}")
+
+        report(f"   Confirmaciones: 3/3")
+        report(f"✅ Pago exitoso con {self.crypto_type}")
         return True
 
     def get_payment_info(self) -> Dict[str, Any]:
         return {
             "metodo": f"Criptomoneda ({self.crypto_type})",
             "billetera": self.wallet_address,
-            "estado": "Confirmado" if self.confirmed else "Pendiente"
+            "estado": "Confirmado" if self.confirmed and not self.pending_transactions else "Pendiente"
         }
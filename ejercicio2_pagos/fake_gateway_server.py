@@ -0,0 +1,83 @@
+import asyncio
+import itertools
+from typing import Optional, Set
+
+
+class FakeGatewayServer:
+    """
+    Pasarela de pagos local (simulada) con latencias inyectadas.
+
+    Protocolo de líneas:
+      HELLO <cliente>       -> WELCOME   (tarda `handshake_latency`)
+      PING                  -> PONG
+      PAY <cuenta> <monto>  -> OK <id> | ERR <motivo>   (tarda `request_latency`)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        handshake_latency: float = 0.05,
+        request_latency: float = 0.005,
+    ):
+        self.host = host
+        self.port = port
+        self.handshake_latency = handshake_latency
+        self.request_latency = request_latency
+        self.handshakes = 0
+        self.payments = 0
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    async def start(self) -> "FakeGatewayServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._connections:
+            _, still_open = await asyncio.wait(self._connections, timeout=1.0)
+            for task in still_open:
+                task.cancel()
+            await asyncio.gather(*still_open, return_exceptions=True)
+
+    async def __aenter__(self) -> "FakeGatewayServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        greeted = False
+        try:
+            while line := await reader.readline():
+                command, *args = line.decode("utf-8").split()
+                if command == "HELLO":
+                    await asyncio.sleep(self.handshake_latency)
+                    self.handshakes += 1
+                    greeted = True
+                    reply = "WELCOME"
+                elif not greeted:
+                    reply = "ERR handshake requerido"
+                elif command == "PING":
+                    reply = "PONG"
+                elif command == "PAY" and len(args) == 2:
+                    await asyncio.sleep(self.request_latency)
+                    self.payments += 1
+                    reply = f"OK {next(self._ids)}" if float(args[1]) > 0 else "ERR monto inválido"
+                else:
+                    reply = "ERR comando desconocido"
+                writer.write(reply.encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
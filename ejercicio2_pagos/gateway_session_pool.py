@@ -0,0 +1,132 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+
+class GatewaySession:
+    """
+    Conexión abierta con una pasarela (protocolo de líneas).
+    El handshake se hace una sola vez al abrir la sesión.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self.last_used = time.monotonic()
+
+    @classmethod
+    async def open(cls, host: str, port: int, client_id: str) -> "GatewaySession":
+        reader, writer = await asyncio.open_connection(host, port)
+        session = cls(reader, writer)
+        reply = await session.request(f"HELLO {client_id}")
+        if reply != "WELCOME":
+            await session.close()
+            raise ConnectionError(f"Handshake rechazado: {reply}")
+        return session
+
+    async def request(self, line: str) -> str:
+        self._writer.write(line.encode("utf-8") + b"\n")
+        await self._writer.drain()
+        reply = await self._reader.readline()
+        if not reply:
+            raise ConnectionError("La pasarela cerró la conexión")
+        self.last_used = time.monotonic()
+        return reply.decode("utf-8").rstrip("\n")
+
+    async def ping(self) -> bool:
+        try:
+            return await self.request("PING") == "PONG"
+        except (ConnectionError, OSError):
+            return False
+
+    @property
+    def closed(self) -> bool:
+        return self._writer.is_closing()
+
+    async def close(self) -> None:
+        if not self._writer.is_closing():
+            self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+class GatewaySessionPool:
+    """
+    Pool de sesiones con una pasarela, compartido por pagos concurrentes.
+
+    - Abre como máximo `size` sesiones (bajo demanda) y las mantiene vivas.
+    - Antes de reutilizar una sesión ociosa por más de `health_check_interval`
+      segundos le hace PING; si no responde, se descarta y se abre otra.
+    - Con keepalive=False cada uso abre y cierra su sesión (sirve como
+      referencia de lo que cuesta el handshake por pago).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        size: int = 8,
+        client_id: str = "payments",
+        health_check_interval: float = 30.0,
+        keepalive: bool = True,
+    ):
+        if size < 1:
+            raise ValueError("size debe ser >= 1")
+        self.host = host
+        self.port = port
+        self.size = size
+        self.client_id = client_id
+        self.health_check_interval = health_check_interval
+        self.keepalive = keepalive
+        self._idle: List[GatewaySession] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.opened = 0
+        self.discarded = 0
+
+    async def _checkout(self) -> GatewaySession:
+        while self._idle:
+            session = self._idle.pop()
+            if session.closed:
+                self.discarded += 1
+                continue
+            if time.monotonic() - session.last_used >= self.health_check_interval:
+                if not await session.ping():
+                    self.discarded += 1
+                    await session.close()
+                    continue
+            return session
+        self.opened += 1
+        return await GatewaySession.open(self.host, self.port, self.client_id)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[GatewaySession]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            session = await self._checkout()
+            try:
+                yield session
+            except BaseException:
+                # Estado incierto de la conexión: no se devuelve al pool
+                self.discarded += 1
+                await session.close()
+                raise
+            if self.keepalive and not session.closed:
+                self._idle.append(session)
+            else:
+                await session.close()
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._idle.pop().close()
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "opened": self.opened,
+            "discarded": self.discarded,
+        }
@@ -0,0 +1,155 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+
+# Valores de la columna success: además de 1/0, una fila en curso
+_PENDING = -1
+
+
+class IdempotencyStore:
+    """
+    Resultados de pagos por clave de idempotencia.
+
+    - Memoria: LRU acotado a `max_entries` con vencimiento (`ttl` segundos).
+      Cada entrada guarda (vencimiento, monto): el vencimiento con signo
+      positivo si el pago fue exitoso y negativo si falló.
+    - Disco: tabla SQLite (modo WAL) que sobrevive a reinicios y cubre las
+      claves que ya salieron del LRU.
+
+    `begin` reserva la clave con una fila PENDIENTE antes de cobrar: si el
+    proceso cae durante el pago la fila queda y la clave no vuelve a cobrarse
+    sola (hay que conciliar y cerrarla con `put`, o borrarla con `discard`).
+    Cada clave queda atada al monto con que se reservó.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        ttl: float = 24 * 3600,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._memory: "OrderedDict[str, Tuple[float, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            " key TEXT PRIMARY KEY, success INTEGER NOT NULL, expires_at REAL NOT NULL, amount REAL)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(idempotency)")}
+        if "amount" not in columns:
+            # Base creada antes de atar las claves al monto
+            self._conn.execute("ALTER TABLE idempotency ADD COLUMN amount REAL")
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, packed: float, amount: Optional[float]) -> None:
+        self._memory[key] = (packed, amount)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _cached(self, key: str, now: float) -> Optional[Tuple[Optional[bool], Optional[float]]]:
+        # Se llama con el lock tomado: sólo la capa en memoria (resultados finales)
+        cached = self._memory.get(key)
+        if cached is not None:
+            packed, amount = cached
+            if abs(packed) > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return packed > 0, amount
+            del self._memory[key]
+        return None
+
+    def _lookup(self, key: str, now: float) -> Optional[Tuple[Optional[bool], Optional[float]]]:
+        # Se llama con el lock tomado: (resultado o None si está pendiente, monto)
+        found = self._cached(key, now)
+        if found is not None:
+            return found
+        return self._lookup_disk(key, now)
+
+    def _lookup_disk(self, key: str, now: float) -> Optional[Tuple[Optional[bool], Optional[float]]]:
+        row = self._conn.execute(
+            "SELECT success, expires_at, amount FROM idempotency WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            self.misses += 1
+            return None
+        success, expires_at, amount = row
+        self.disk_hits += 1
+        if success == _PENDING:
+            return None, amount
+        self._remember(key, expires_at if success else -expires_at, amount)
+        return bool(success), amount
+
+    def get(self, key: str) -> Optional[bool]:
+        """Resultado guardado para `key`, o None si no existe, venció o sigue pendiente."""
+        with self._lock:
+            found = self._lookup(key, self._clock())
+        return None if found is None else found[0]
+
+    def begin(self, key: str, amount: float) -> Optional[Tuple[Optional[bool], Optional[float]]]:
+        """
+        Reserva `key` para un pago de `amount` con una fila PENDIENTE.
+
+        Retorna None si la reservó; si la clave ya existe no la toca y retorna
+        (resultado, monto), con resultado None mientras siga pendiente.
+        """
+        now = self._clock()
+        with self._lock:
+            # Un acierto en memoria no abre transacción: no compite por el lock de escritura
+            found = self._cached(key, now)
+            if found is not None:
+                return found
+            # IMMEDIATE: otro proceso con la misma base no puede reservarla a la vez
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                found = self._lookup_disk(key, now)
+                if found is None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO idempotency (key, success, expires_at, amount) VALUES (?, ?, ?, ?)",
+                        (key, _PENDING, now + self.ttl, amount),
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return found
+
+    def put(self, key: str, success: bool, amount: Optional[float] = None) -> None:
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO idempotency (key, success, expires_at, amount) VALUES (?, ?, ?, ?)",
+                (key, int(success), expires_at, amount),
+            )
+            self._remember(key, expires_at if success else -expires_at, amount)
+
+    def discard(self, key: str) -> None:
+        """Olvida `key` (p. ej. una reserva cuyo pago falló sin cobrar)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM idempotency WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+
+    def purge_expired(self) -> int:
+        """Borra del disco las claves vencidas. Retorna cuántas se eliminaron."""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM idempotency WHERE expires_at <= ?", (self._clock(),)
+            ).rowcount
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
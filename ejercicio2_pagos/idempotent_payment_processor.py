@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, Tuple
+
+from idempotency_store import IdempotencyStore
+from payment_processor import PaymentProcessor
+
+
+class PaymentInProgressError(RuntimeError):
+    """La clave tiene un pago PENDIENTE sin resultado (otro proceso, o uno que cayó a mitad)."""
+
+
+class IdempotentPaymentProcessor:
+    """
+    Capa de idempotencia delante de PaymentProcessor.
+
+    Cada pago lleva una clave del llamador: si la clave ya se procesó se
+    retorna el resultado guardado sin volver a llamar a PaymentMethod.pay.
+    Si llegan duplicados mientras el primero sigue en curso, esperan su
+    resultado en vez de ejecutarse de nuevo.
+
+    Antes de cobrar se guarda la clave como PENDIENTE junto con el monto: una
+    caída durante el pago no habilita un segundo cobro (la clave queda
+    pendiente hasta conciliarla) y reutilizar la clave con otro monto es un
+    error (ValueError).
+    """
+
+    def __init__(self, processor: PaymentProcessor, store: IdempotencyStore):
+        self.processor = processor
+        self.store = store
+        self._in_flight: Dict[str, Tuple[float, Future]] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.replayed = 0
+        self.collapsed = 0
+
+    @staticmethod
+    def _check_amount(key: str, expected: float, amount: float) -> None:
+        if round(expected, 2) != round(amount, 2):
+            raise ValueError(f"La clave {key!r} ya se usó con otro monto (${expected:.2f})")
+
+    def process_payment(self, idempotency_key: str, amount: float, description: str = "Compra") -> bool:
+        # El lock sólo cubre el mapa de pagos en curso; el store se consulta afuera
+        with self._lock:
+            in_flight = self._in_flight.get(idempotency_key)
+            if in_flight is None:
+                pending: Future = Future()
+                self._in_flight[idempotency_key] = (amount, pending)
+            else:
+                self.collapsed += 1
+
+        if in_flight is not None:
+            reserved_amount, pending = in_flight
+            self._check_amount(idempotency_key, reserved_amount, amount)
+            return pending.result()
+
+        try:
+            found = self.store.begin(idempotency_key, amount)
+            if found is not None:
+                success, stored_amount = found
+                if stored_amount is not None:
+                    self._check_amount(idempotency_key, stored_amount, amount)
+                if success is None:
+                    raise PaymentInProgressError(f"El pago con clave {idempotency_key!r} sigue pendiente")
+                self.replayed += 1
+            else:
+                try:
+                    success = self.processor.process_payment(amount, description)
+                except BaseException:
+                    # pay() lanzó sin resultado: un reintento con la misma clave vuelve a ejecutarse
+                    self.store.discard(idempotency_key)
+                    raise
+                self.executed += 1
+                # Si esto falla el cobro ya ocurrió: la fila queda PENDIENTE y la
+                # clave no vuelve a cobrarse hasta conciliarla
+                self.store.put(idempotency_key, success, amount)
+        except BaseException as error:
+            pending.set_exception(error)
+            raise
+        else:
+            pending.set_result(success)
+        finally:
+            with self._lock:
+                del self._in_flight[idempotency_key]
+        return success
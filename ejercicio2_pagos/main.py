@@ -3,6 +3,9 @@ from paypal_payment import PayPalPayment
 from bank_transfer_payment import BankTransferPayment
 from crypto_payment import CryptoPayment
 from payment_processor import PaymentProcessor
+from confirmation_scheduler import ConfirmationScheduler
+from simulated_chain import SimulatedChain
+import time
 
 
 def print_section(title: str):
@@ -75,8 +78,34 @@ def main():
     print(f"{'-'*59}")
     
     for tx in processor.transaction_history:
-        status_emoji = "✅" if tx["status"] == "Exitoso" else "❌"
-        print(f"{tx['description']:<35} ${tx['amount']:<11.2f} {status_emoji} {tx['status']:<8}")
+        status_emoji = {"Exitoso": "✅", "Pendiente": "⏳"}.get(tx.status, "❌")
+        print(f"{tx.description:<35} ${tx.amount:<11.2f} {status_emoji} {tx.status:<8}")
+
+    # Totales acumulados por método (O(1), sin recorrer el historial)
+    ledger = processor.ledger
+    print(f"\n{'Método':<35} {'Exitosos':<10} {'Cobrado':<12}")
+    print(f"{'-'*59}")
+    for method in ledger.methods():
+        print(f"{method:<35} {ledger.count(method, 'Exitoso'):<10} ${ledger.total(method, 'Exitoso'):<11.2f}")
+
+    # 9. Cripto sin bloquear: la confirmación llega en segundo plano
+    print_section("8. CRIPTO CON CONFIRMACIÓN EN SEGUNDO PLANO")
+    chain = SimulatedChain(block_time=0.1, max_inclusion_delay=0.3)
+    scheduler = ConfirmationScheduler(chain, poll_interval=0.1, timeout=5.0).start()
+    async_crypto = CryptoPayment(
+        wallet_address="0x9F8E7D6C5B4A3210...",
+        crypto_type="Ethereum",
+        confirmation_scheduler=scheduler
+    )
+    processor.change_payment_method(async_crypto)
+    processor.process_payment(750.00, "Pago con confirmación diferida")
+    record = list(processor.transaction_history)[-1]
+    print(f"\nEstado inmediato: {async_crypto.get_payment_info()['estado']} (ledger: {record.status})")
+    while async_crypto.pending_transactions:
+        time.sleep(0.1)
+    scheduler.stop()
+    print(f"Estado final: {async_crypto.get_payment_info()['estado']} (ledger: {record.status}, "
+          f"{chain.batch_calls} consultas a la cadena)")
     
 
 
@@ -1,5 +1,27 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+_output = threading.local()
+
+
+def report(message: str) -> None:
+    """print() de los métodos de pago; no imprime si el hilo actual está en modo silencioso."""
+    if not getattr(_output, "quiet", False):
+        print(message)
+
+
+@contextmanager
+def quiet(enabled: bool = True) -> Iterator[None]:
+    """Silencia report() sólo en el hilo actual (los demás hilos siguen imprimiendo)."""
+    previous = getattr(_output, "quiet", False)
+    _output.quiet = enabled
+    try:
+        yield
+    finally:
+        _output.quiet = previous
 
 
 class PaymentMethod(ABC):
@@ -9,6 +31,9 @@ class PaymentMethod(ABC):
     Aplica Dependency Inversion y Open/Closed.
     """
 
+    # Monto máximo por pago (None = sin límite)
+    max_amount: Optional[float] = None
+
     @abstractmethod
     def validate(self) -> bool:
         """Valida que el método de pago esté correctamente configurado."""
@@ -19,6 +44,14 @@ class PaymentMethod(ABC):
         """Procesa el pago. Retorna True si fue exitoso, False en caso contrario."""
         pass
 
+    def pay_deferred(self, amount: float, on_settled: Callable[[bool], None]) -> Optional[bool]:
+        """
+        Como pay(), pero un método que confirma más tarde puede retornar None
+        (pendiente) y llamar a `on_settled(éxito)` cuando conozca el resultado.
+        Por defecto el resultado es inmediato.
+        """
+        return self.pay(amount)
+
     @abstractmethod
     def get_payment_info(self) -> Dict[str, Any]:
         """Retorna información sobre el método de pago."""
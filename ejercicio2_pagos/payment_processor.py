@@ -1,4 +1,49 @@
-from payment_method import PaymentMethod
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from batch_result import BatchResult
+from batch_validator import BatchValidator
+from payment_method import PaymentMethod, quiet, report
+from transaction_ledger import Transaction, TransactionLedger
+
+
+_settle_lock = threading.Lock()
+
+
+class _Settlement:
+    """
+    Resultado diferido de un pago (pay_deferred retornó None): lleva al
+    ledger el estado final aunque llegue antes de que exista el registro.
+    """
+
+    __slots__ = ("ledger", "record", "outcome")
+
+    def __init__(self, ledger: TransactionLedger):
+        self.ledger = ledger
+        self.record: Optional[Transaction] = None
+        self.outcome: Optional[bool] = None
+
+    def __call__(self, success: bool) -> None:
+        with _settle_lock:
+            self.outcome = success
+            record = self.record
+        if record is not None:
+            self.ledger.settle(record, _status(success))
+
+    def attach(self, record: Transaction) -> None:
+        with _settle_lock:
+            self.record = record
+            outcome = self.outcome
+        if outcome is not None:
+            self.ledger.settle(record, _status(outcome))
+
+
+def _status(success: Optional[bool]) -> str:
+    if success is None:
+        return "Pendiente"
+    return "Exitoso" if success else "Fallido"
 
 
 class PaymentProcessor:
@@ -8,38 +53,119 @@ class PaymentProcessor:
     Esto permite agregar nuevos métodos de pago sin modificar esta clase (OCP).
     """
 
-    def __init__(self, payment_method: PaymentMethod):
+    def __init__(
+        self,
+        payment_method: PaymentMethod,
+        verbose: bool = True,
+        ledger: Optional[TransactionLedger] = None,
+    ):
         self.payment_method = payment_method
-        self.transaction_history = []
+        self.verbose = verbose
+        self.ledger = ledger if ledger is not None else TransactionLedger()
+
+    @property
+    def transaction_history(self) -> TransactionLedger:
+        """Historial reciente (acotado); los totales están en `ledger`."""
+        return self.ledger
 
     def process_payment(self, amount: float, description: str = "Compra") -> bool:
-        """Procesa un pago usando el método de pago inyectado."""
-        print(f"\n{'='*50}")
-        print(f"Procesando: {description}")
-        print(f"Monto: ${amount:.2f}")
-        print(f"Método: {self.payment_method.get_payment_info()['metodo']}")
-        print(f"{'='*50}")
-        
-        success = self.payment_method.pay(amount)
-        
-        if success:
-            self.transaction_history.append({
-                "amount": amount,
-                "description": description,
-                "method": self.payment_method.get_payment_info()["metodo"],
-                "status": "Exitoso"
-            })
-        else:
-            self.transaction_history.append({
-                "amount": amount,
-                "description": description,
-                "method": self.payment_method.get_payment_info()["metodo"],
-                "status": "Fallido"
-            })
-        
+        """
+        Procesa un pago usando el método de pago inyectado.
+        Un pago que queda a la espera de confirmación se registra "Pendiente"
+        y el ledger pasa a "Exitoso" o "Fallido" cuando llega el resultado;
+        retorna True (aceptado).
+        """
+        method_name = self.payment_method.get_payment_info()["metodo"]
+
+        # Silencia sólo este hilo (incluido lo que imprima pay())
+        with quiet(not self.verbose):
+            report(f"\n{'='*50}")
+            report(f"Procesando: {description}")
+            report(f"Monto: ${amount:.2f}")
+            report(f"Método: {method_name}")
+            report(f"{'='*50}")
+
+            settlement = _Settlement(self.ledger)
+            success = self.payment_method.pay_deferred(amount, settlement)
+
+        record = self.ledger.append(amount, description, method_name, _status(success))
+        if success is None:
+            settlement.attach(record)
+            return True
         return success
 
+    def process_batch(
+        self,
+        payments: Iterable[Tuple[PaymentMethod, float, str]],
+        concurrency: Union[int, Dict[str, int]] = 4,
+        verbose: Optional[bool] = False,
+        validator: Optional[BatchValidator] = None,
+    ) -> BatchResult:
+        """
+        Procesa un lote de (método, monto, descripción).
+
+        Los pagos se agrupan por implementación de PaymentMethod y cada grupo
+        se reparte entre a lo sumo `concurrency` hilos (un int para todos, o un
+        dict por nombre de clase, p. ej. {"PayPalPayment": 8}).
+        get_payment_info() se consulta una sola vez por método.
+        Con un `validator`, los pagos rechazados en la pre-validación se marcan
+        como fallidos sin llamar a pay() (sirve para conocer los motivos antes
+        de tocar la pasarela; no acelera el lote). Los pagos que quedan pendientes de
+        confirmación cuentan como aceptados en el resultado y se registran
+        "Pendiente" en el ledger hasta que se resuelven.
+        """
+        items: List[Tuple[PaymentMethod, float, str]] = list(payments)
+        result = BatchResult(len(items))
+        method_ids: Dict[int, int] = {}
+        groups: Dict[str, List[int]] = defaultdict(list)
+        deferred: Dict[int, _Settlement] = {}
+        codes = validator.validate(items).codes if validator is not None else None
+
+        for position, (method, amount, _) in enumerate(items):
+            if id(method) not in method_ids:
+                method_ids[id(method)] = result.method_id(method.get_payment_info()["metodo"])
+            if codes is not None and codes[position]:
+                result.set(position, method_ids[id(method)], amount, False)
+                continue
+            groups[type(method).__name__].append(position)
+
+        silent = not (self.verbose if verbose is None else verbose)
+
+        def run(positions: List[int]) -> None:
+            with quiet(silent):
+                for position in positions:
+                    method, amount, _ = items[position]
+                    settlement = _Settlement(self.ledger)
+                    try:
+                        success = method.pay_deferred(amount, settlement)
+                    except Exception:
+                        success = False
+                    if success is None:
+                        deferred[position] = settlement
+                        success = True
+                    result.set(position, method_ids[id(method)], amount, success)
+
+        workers = []
+        for implementation, positions in groups.items():
+            limit = concurrency if isinstance(concurrency, int) else concurrency.get(implementation, 1)
+            limit = max(1, min(limit, len(positions)))
+            workers += [positions[offset::limit] for offset in range(limit)]
+
+        with ThreadPoolExecutor(max_workers=max(1, len(workers))) as pool:
+            for future in [pool.submit(run, chunk) for chunk in workers]:
+                future.result()
+
+        for position, (_, amount, description) in enumerate(items):
+            method_name, _, success = result[position]
+            settlement = deferred.get(position)
+            record = self.ledger.append(amount, description, method_name, _status(None if settlement else success))
+            if settlement is not None:
+                settlement.attach(record)
+
+        return result
+
     def change_payment_method(self, new_method: PaymentMethod) -> None:
         """Permite cambiar el método de pago en tiempo de ejecución."""
-        print(f"\n✏️ Cambiando método de pago a: {new_method.get_payment_info()['metodo']}")
+        if self.verbose:
+            report(f"\n✏️ Cambiando método de pago a: {new_method.get_payment_info()['metodo']}")
         self.payment_method = new_method
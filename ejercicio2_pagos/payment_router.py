@@ -0,0 +1,192 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from payment_method import PaymentMethod
+
+
+class _Shard:
+    """Contadores de los hilos cuyo id cae en este shard, con su propio lock."""
+
+    __slots__ = ("lock", "epochs", "calls", "errors", "latency")
+
+    def __init__(self, buckets: int):
+        self.lock = threading.Lock()
+        self.epochs = [-1] * buckets
+        self.calls = [0] * buckets
+        self.errors = [0] * buckets
+        self.latency = [0.0] * buckets
+
+
+class SlidingWindowStats:
+    """
+    Llamadas, errores y latencia de un método en una ventana deslizante de
+    `window` segundos dividida en `buckets` intervalos.
+
+    Los contadores están repartidos en `shards` grupos fijos, elegidos por
+    `threading.get_native_id() % shards` (el id del sistema es secuencial;
+    get_ident() es una dirección alineada y caería siempre en el mismo shard).
+    Hilos distintos casi nunca compiten por el mismo lock y la memoria no
+    crece aunque se creen hilos nuevos en cada lote. Leer suma los shards sin
+    tomar sus locks; la lectura es aproximada si coincide con una escritura,
+    lo cual es aceptable para decidir rutas.
+    """
+
+    def __init__(
+        self,
+        window: float = 30.0,
+        buckets: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        shards: int = 16,
+    ):
+        self._width = window / buckets
+        self._buckets = buckets
+        self._clock = clock
+        self._shards: List[_Shard] = [_Shard(buckets) for _ in range(shards)]
+
+    def record(self, latency: float, error: bool) -> None:
+        epoch = int(self._clock() / self._width)
+        slot = epoch % self._buckets
+        shard = self._shards[threading.get_native_id() % len(self._shards)]
+        with shard.lock:
+            if shard.epochs[slot] != epoch:
+                shard.epochs[slot] = epoch
+                shard.calls[slot] = shard.errors[slot] = 0
+                shard.latency[slot] = 0.0
+            shard.calls[slot] += 1
+            shard.errors[slot] += error
+            shard.latency[slot] += latency
+
+    def snapshot(self) -> Tuple[int, int, float]:
+        """(llamadas, errores, latencia media) dentro de la ventana."""
+        oldest = int(self._clock() / self._width) - self._buckets + 1
+        calls = errors = 0
+        latency = 0.0
+        for shard in self._shards:
+            for slot in range(self._buckets):
+                if shard.epochs[slot] >= oldest:
+                    calls += shard.calls[slot]
+                    errors += shard.errors[slot]
+                    latency += shard.latency[slot]
+        return calls, errors, (latency / calls if calls else 0.0)
+
+
+class _Route:
+    __slots__ = ("name", "method", "cost", "stats", "limit", "score", "degraded")
+
+    def __init__(self, name: str, method: PaymentMethod, cost: float, stats: SlidingWindowStats):
+        self.name = name
+        self.method = method
+        self.cost = cost
+        self.stats = stats
+        self.limit = float("inf") if method.max_amount is None else float(method.max_amount)
+        self.score = cost
+        self.degraded = False
+
+
+class PaymentRouter(PaymentMethod):
+    """
+    Método de pago compuesto que elige, por cada pago, entre los
+    PaymentMethod registrados.
+
+    Puntaje (menor es mejor) = costo + latency_weight * latencia media
+    + error_weight * tasa de error, con estadísticas de una ventana deslizante.
+    Un método con tasa de error >= `degraded_error_rate` (y al menos
+    `min_samples` llamadas) se considera degradado y sólo se usa si no hay
+    otro. Se respetan los límites (max_amount) de cada método y se saltean
+    los que no pasan validate().
+
+    Una excepción de la pasarela cuenta como error y pasa al siguiente
+    método. Un pay() que retorna False también cuenta como error en las
+    estadísticas (las pasarelas convierten fallas de conexión en False, ver
+    AsyncPayPalPayment), pero no se reintenta en otra pasarela: no se puede
+    distinguir de un rechazo. Un monto <= 0 no se enruta.
+
+    Los puntajes se recalculan como mucho cada `refresh_interval` segundos,
+    así la decisión por pago es sólo filtrar una lista ya ordenada.
+    """
+
+    def __init__(
+        self,
+        latency_weight: float = 1.0,
+        error_weight: float = 10.0,
+        degraded_error_rate: float = 0.5,
+        min_samples: int = 20,
+        max_attempts: int = 2,
+        refresh_interval: float = 0.05,
+        window: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.latency_weight = latency_weight
+        self.error_weight = error_weight
+        self.degraded_error_rate = degraded_error_rate
+        self.min_samples = min_samples
+        self.max_attempts = max_attempts
+        self.refresh_interval = refresh_interval
+        self._window = window
+        self._clock = clock
+        self._routes: List[_Route] = []
+        self._ranked: List[_Route] = []
+        self._refreshed_at = float("-inf")
+        self._refresh_lock = threading.Lock()
+        self.last_choice: Optional[str] = None
+
+    def register(self, method: PaymentMethod, cost: float = 0.0, name: Optional[str] = None) -> None:
+        name = name or method.get_payment_info()["metodo"]
+        self._routes.append(_Route(name, method, cost, SlidingWindowStats(self._window, clock=self._clock)))
+        self._refreshed_at = float("-inf")
+
+    def _refresh(self) -> List[_Route]:
+        with self._refresh_lock:
+            for route in self._routes:
+                calls, errors, latency = route.stats.snapshot()
+                error_rate = errors / calls if calls else 0.0
+                route.degraded = calls >= self.min_samples and error_rate >= self.degraded_error_rate
+                route.score = route.cost + self.latency_weight * latency + self.error_weight * error_rate
+            self._ranked = sorted(self._routes, key=lambda route: (route.degraded, route.score))
+            self._refreshed_at = self._clock()
+            return self._ranked
+
+    def route(self, amount: float) -> List[_Route]:
+        """Candidatos para `amount`, del mejor al peor."""
+        ranked = self._ranked
+        if self._clock() - self._refreshed_at >= self.refresh_interval:
+            ranked = self._refresh()
+        return [route for route in ranked if amount <= route.limit]
+
+    # Contrato PaymentMethod
+
+    def validate(self) -> bool:
+        return any(route.method.validate() for route in self._routes)
+
+    def pay(self, amount: float) -> bool:
+        if amount <= 0:
+            return False
+        attempts = 0
+        for route in self.route(amount):
+            if attempts >= self.max_attempts:
+                break
+            if not route.method.validate():
+                continue
+            attempts += 1
+            self.last_choice = route.name
+            start = time.perf_counter()
+            try:
+                success = bool(route.method.pay(amount))
+            except Exception:
+                # Falla de la pasarela: cuenta como error y se prueba la siguiente
+                route.stats.record(time.perf_counter() - start, True)
+                continue
+            route.stats.record(time.perf_counter() - start, not success)
+            return success
+        return False
+
+    def get_payment_info(self) -> Dict[str, Any]:
+        return {
+            "metodo": "Enrutador de pagos",
+            "ultimo": self.last_choice,
+            "rutas": [
+                {"metodo": route.name, "puntaje": round(route.score, 6), "degradado": route.degraded}
+                for route in self._ranked
+            ],
+        }
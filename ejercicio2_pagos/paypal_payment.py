@@ -1,4 +1,4 @@
-from payment_method import PaymentMethod
+from payment_method import PaymentMethod, report
 from typing import Dict, Any
 
 
@@ -16,24 +16,30 @@ class PayPalPayment(PaymentMethod):
         """Valida que el email de PayPal sea válido."""
         return "@" in self.email and "." in self.email
 
+    def _connect_to_paypal(self) -> bool:
+        """Simula la conexión con PayPal; se establece una sola vez y se reutiliza."""
+        if not self.connected:
+            report(f"   🔌 Conectando con PayPal...")
+            self.connected = True
+        return self.connected
 
     def pay(self, amount: float) -> bool:
         """Procesa el pago con PayPal."""
         if not self.validate():
-            print(f"❌ Error: Email de PayPal inválido: {self.email}")
+            report(f"❌ Error: Email de PayPal inválido: {self.email}")
             return False
         
         if amount <= 0:
-            print(f"❌ Error: El monto debe ser mayor a $0")
+            report(f"❌ Error: El monto debe ser mayor a $0")
             return False
         
         if not self._connect_to_paypal():
-            print(f"❌ Error: No se pudo conectar con PayPal")
+            report(f"❌ Error: No se pudo conectar con PayPal")
             return False
         
-        print(f"🌐 Procesando pago de ${amount:.2f} con PayPal")
-        print(f"   Cuenta: {self.email}")
-        print(f"✅ Pago exitoso con PayPal")
+        report(f"🌐 Procesando pago de ${amount:.2f} con PayPal")
+        report(f"   Cuenta: {self.email}")
+        report(f"✅ Pago exitoso con PayPal")
         return True
 
     def get_payment_info(self) -> Dict[str, Any]:
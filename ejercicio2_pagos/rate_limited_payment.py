@@ -0,0 +1,79 @@
+import time
+from typing import Any, Dict
+
+from adaptive_concurrency import AdaptiveConcurrencyLimiter
+from async_payment_method import AsyncPaymentMethod
+from payment_method import PaymentMethod
+from token_bucket import TokenBucket
+
+
+def _limits(bucket: TokenBucket, limiter: AdaptiveConcurrencyLimiter) -> Dict[str, Any]:
+    return {"token_bucket": bucket.metrics(), "concurrency": limiter.metrics()}
+
+
+class RateLimitedPaymentMethod(PaymentMethod):
+    """
+    Decorador de PaymentMethod (hilos): antes de llamar a la pasarela toma un
+    token de su bucket y un lugar del limitador de concurrencia adaptativo,
+    que aprende de la latencia de cada respuesta. Lo achican las excepciones
+    (fallas o timeouts de la pasarela) y también un pay() que retorna False:
+    AsyncPayPalPayment, por ejemplo, convierte las fallas de conexión en False
+    y no hay forma de distinguirlas de un rechazo.
+    """
+
+    def __init__(self, method: PaymentMethod, bucket: TokenBucket, limiter: AdaptiveConcurrencyLimiter):
+        self.method = method
+        self.bucket = bucket
+        self.limiter = limiter
+        self.max_amount = method.max_amount
+
+    def validate(self) -> bool:
+        return self.method.validate()
+
+    def pay(self, amount: float) -> bool:
+        self.bucket.acquire()
+        self.limiter.acquire()
+        start = time.perf_counter()
+        error = True  # si pay() lanza, queda como error
+        try:
+            success = self.method.pay(amount)
+            error = not success
+            return success
+        finally:
+            self.limiter.release(time.perf_counter() - start, error=error)
+
+    def get_payment_info(self) -> Dict[str, Any]:
+        return self.method.get_payment_info()
+
+    def metrics(self) -> Dict[str, Any]:
+        return _limits(self.bucket, self.limiter)
+
+
+class AsyncRateLimitedPaymentMethod(AsyncPaymentMethod):
+    """Lo mismo que RateLimitedPaymentMethod para métodos asíncronos."""
+
+    def __init__(self, method: AsyncPaymentMethod, bucket: TokenBucket, limiter: AdaptiveConcurrencyLimiter):
+        self.method = method
+        self.bucket = bucket
+        self.limiter = limiter
+
+    def validate(self) -> bool:
+        return self.method.validate()
+
+    async def pay(self, amount: float) -> bool:
+        await self.bucket.acquire_async()
+        await self.limiter.acquire_async()
+        start = time.perf_counter()
+        error = True
+        try:
+            success = await self.method.pay(amount)
+            error = not success
+            return success
+        finally:
+            self.limiter.release(time.perf_counter() - start, error=error)
+
+    def get_payment_info(self) -> Dict[str, Any]:
+        return self.method.get_payment_info()
+
+    def metrics(self) -> Dict[str, Any]:
+        return _limits(self.bucket, self.limiter)
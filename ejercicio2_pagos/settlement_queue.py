@@ -0,0 +1,71 @@
+import csv
+import itertools
+import os
+import threading
+from collections import deque
+from typing import Deque, Tuple
+
+
+SETTLEMENT_HEADER = ("transfer_id", "cuenta", "banco", "monto")
+
+
+class SettlementQueue:
+    """
+    Cola de transferencias pendientes de liquidación.
+    Como en los lotes nocturnos ACH/SEPA, las transferencias no se liquidan una
+    a una: se acumulan y se escriben juntas en un archivo de liquidación.
+    """
+
+    _WRITE_CHUNK = 10_000
+
+    def __init__(self, prefix: str = "TRF"):
+        self._prefix = prefix
+        self._ids = itertools.count(1)
+        self._pending: Deque[Tuple[str, str, str, float]] = deque()
+        self._lock = threading.Lock()
+
+    def enqueue(self, account_number: str, bank_name: str, amount: float) -> str:
+        """Agrega una transferencia y retorna su id."""
+        with self._lock:
+            transfer_id = f"{self._prefix}{next(self._ids):010d}"
+            self._pending.append((transfer_id, account_number, bank_name, amount))
+        return transfer_id
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def write_settlement_file(self, path: str) -> int:
+        """
+        Escribe todas las transferencias pendientes en un archivo CSV de
+        liquidación, en bloques de filas y con un buffer grande.
+        El archivo se escribe aparte y se renombra recién con fsync hecho; si
+        algo falla las transferencias vuelven a la cola (delante de las que
+        llegaron mientras tanto). Retorna cuántas se escribieron.
+        """
+        with self._lock:
+            batch, self._pending = self._pending, deque()
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(SETTLEMENT_HEADER)
+                rows = iter(batch)
+                while True:
+                    chunk = list(itertools.islice(rows, self._WRITE_CHUNK))
+                    if not chunk:
+                        break
+                    writer.writerows(
+                        (transfer_id, account, bank, f"{amount:.2f}")
+                        for transfer_id, account, bank, amount in chunk
+                    )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            with self._lock:
+                batch.extend(self._pending)
+                self._pending = batch
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return len(batch)
@@ -0,0 +1,86 @@
+import csv
+import os
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class ReconciliationReport:
+    settled: int = 0
+    rejected: int = 0
+    missing: int = 0          # transferencias sin respuesta del banco
+    unknown: int = 0          # respuestas que no corresponden a ninguna transferencia
+    settled_amount: float = 0.0
+
+
+class SettlementReconciler:
+    """
+    Concilia un archivo de liquidación contra el archivo de estados del banco
+    (`transfer_id,estado[,motivo]`, estado = ACEPTADA | RECHAZADA).
+
+    En vez de comparar con bucles anidados se hace un hash join por
+    particiones: ambos archivos se recorren una vez repartiendo filas en
+    `partitions` archivos temporales según crc32(transfer_id); luego, para
+    cada partición, los estados se cargan en un dict y las transferencias se
+    buscan en él. La memoria queda acotada al tamaño de una partición, así que
+    archivos de millones de filas se procesan en streaming.
+    """
+
+    def __init__(self, partitions: int = 64, workdir: Optional[str] = None):
+        self.partitions = partitions
+        self.workdir = workdir
+
+    def _partition(self, path: str, directory: str, name: str, skip_header: bool) -> List[str]:
+        paths = [os.path.join(directory, f"{name}-{n:03d}.csv") for n in range(self.partitions)]
+        files = [open(p, "w", newline="", encoding="utf-8", buffering=1 << 16) for p in paths]
+        writers = [csv.writer(f) for f in files]
+        try:
+            with open(path, newline="", encoding="utf-8", buffering=1 << 20) as source:
+                reader = csv.reader(source)
+                if skip_header:
+                    next(reader, None)
+                for row in reader:
+                    if row:
+                        writers[zlib.crc32(row[0].encode()) % self.partitions].writerow(row)
+        finally:
+            for f in files:
+                f.close()
+        return paths
+
+    def reconcile(
+        self,
+        settlement_path: str,
+        status_path: str,
+        on_result: Optional[Callable[[str, str, float], None]] = None,
+    ) -> ReconciliationReport:
+        """
+        Retorna los totales de la conciliación. `on_result(transfer_id, estado, monto)`
+        se llama por cada transferencia (estado PENDIENTE si el banco no respondió).
+        """
+        report = ReconciliationReport()
+        with tempfile.TemporaryDirectory(dir=self.workdir) as tmp:
+            transfers = self._partition(settlement_path, tmp, "transfers", skip_header=True)
+            statuses = self._partition(status_path, tmp, "statuses", skip_header=False)
+
+            for transfers_part, statuses_part in zip(transfers, statuses):
+                with open(statuses_part, newline="", encoding="utf-8") as f:
+                    index: Dict[str, str] = {row[0]: row[1] for row in csv.reader(f)}
+
+                with open(transfers_part, newline="", encoding="utf-8") as f:
+                    for transfer_id, _, _, amount in csv.reader(f):
+                        status = index.pop(transfer_id, None)
+                        if status is None:
+                            report.missing += 1
+                            status = "PENDIENTE"
+                        elif status == "ACEPTADA":
+                            report.settled += 1
+                            report.settled_amount += float(amount)
+                        else:
+                            report.rejected += 1
+                        if on_result is not None:
+                            on_result(transfer_id, status, float(amount))
+
+                report.unknown += len(index)
+        return report
@@ -0,0 +1,57 @@
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from chain_client import ChainClient
+
+
+class SimulatedChain(ChainClient):
+    """
+    Blockchain simulada para pruebas offline.
+    Se "mina" un bloque cada `block_time` segundos; cada transacción entra en
+    un bloque tras una espera aleatoria y una fracción `drop_rate` nunca se
+    incluye (para ejercitar los timeouts).
+    """
+
+    def __init__(
+        self,
+        block_time: float = 10.0,
+        max_inclusion_delay: float = 30.0,
+        drop_rate: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        seed: Optional[int] = None,
+    ):
+        self.block_time = block_time
+        self.max_inclusion_delay = max_inclusion_delay
+        self.drop_rate = drop_rate
+        self._clock = clock
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._included_at: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+        self.batch_calls = 0
+
+    def submit(self, wallet_address: str, amount: float) -> str:
+        with self._lock:
+            tx_id = f"0x{next(self._ids):064x}"
+            if self._rng.random() < self.drop_rate:
+                self._included_at[tx_id] = None
+            else:
+                delay = self._rng.uniform(0, self.max_inclusion_delay)
+                self._included_at[tx_id] = self._clock() + delay
+        return tx_id
+
+    def get_confirmations(self, tx_ids: List[str]) -> Dict[str, int]:
+        now = self._clock()
+        confirmations = {}
+        with self._lock:
+            self.batch_calls += 1
+            for tx_id in tx_ids:
+                included_at = self._included_at.get(tx_id)
+                if included_at is None or included_at > now:
+                    confirmations[tx_id] = 0
+                else:
+                    confirmations[tx_id] = 1 + int((now - included_at) / self.block_time)
+        return confirmations
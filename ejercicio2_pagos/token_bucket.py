@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict
+
+
+class TokenBucket:
+    """
+    Token bucket por pasarela: `rate` tokens por segundo, ráfagas de hasta `capacity`.
+
+    Cada acquire reserva su token aunque todavía no exista (el saldo puede
+    quedar negativo) y calcula cuánto debe esperar. Así la espera es la misma
+    para un hilo (time.sleep) que para una corrutina (asyncio.sleep) y no hace
+    falta despertar a nadie.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate debe ser > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.throttled = 0
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            self.throttled += 1
+            return -self._tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Toma tokens sólo si hay disponibles ahora mismo."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            tokens = self._tokens
+        return {"rate": self.rate, "capacity": self.capacity, "tokens": tokens, "throttled": self.throttled}
@@ -0,0 +1,202 @@
+import bisect
+import csv
+import os
+import threading
+from collections import defaultdict, deque
+from typing import BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+class Transaction:
+    """Registro de una transacción (con __slots__: sin dict por instancia)."""
+
+    __slots__ = ("seq", "amount", "description", "method", "status")
+
+    def __init__(self, seq: int, amount: float, description: str, method: str, status: str):
+        self.seq = seq
+        self.amount = amount
+        self.description = description
+        self.method = method
+        self.status = status
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "amount": self.amount,
+            "description": self.description,
+            "method": self.method,
+            "status": self.status,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"Transaction(seq={self.seq}, amount={self.amount!r}, description={self.description!r}, "
+            f"method={self.method!r}, status={self.status!r})"
+        )
+
+
+class TransactionLedger:
+    """
+    Libro de transacciones acotado.
+
+    - Buffer circular de `capacity` registros: la memoria no crece con el tiempo.
+    - Al desalojar un registro se agrega a un segmento CSV en disco (`spill_path`),
+      escrito por bloques; sin `spill_path` el registro simplemente se descarta.
+    - Índices secundarios por método y por estado (colas de números de secuencia).
+    - Agregados acumulados (cantidad y suma por método, estado y método+estado)
+      que se actualizan en O(1) en cada `append` e incluyen lo ya desalojado.
+    - Un lock protege anillo, índices y buffer de desalojo: `process_batch`
+      registra desde varios hilos. `close()` escribe lo que quede pendiente.
+    """
+
+    _SPILL_BATCH = 1024
+
+    def __init__(self, capacity: int = 10_000, spill_path: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("capacity debe ser >= 1")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._ring: List[Optional[Transaction]] = [None] * capacity
+        self._next_seq = 0
+        self._by_method: Dict[str, Deque[int]] = defaultdict(deque)
+        self._by_status: Dict[str, Deque[int]] = defaultdict(deque)
+        self._count: Dict[Tuple[Optional[str], Optional[str]], int] = defaultdict(int)
+        self._sum: Dict[Tuple[Optional[str], Optional[str]], float] = defaultdict(float)
+        self._spill_buffer: List[Tuple] = []
+        self._lock = threading.RLock()
+
+    # Escritura
+
+    def append(self, amount: float, description: str, method: str, status: str) -> Transaction:
+        with self._lock:
+            seq = self._next_seq
+            slot = seq % self.capacity
+            evicted = self._ring[slot]
+            if evicted is not None:
+                self._evict(evicted)
+
+            record = Transaction(seq, amount, description, method, status)
+            self._ring[slot] = record
+            self._next_seq += 1
+            self._by_method[method].append(seq)
+            self._by_status[status].append(seq)
+            for key in ((None, None), (method, None), (None, status), (method, status)):
+                self._count[key] += 1
+                self._sum[key] += amount
+            return record
+
+    def _evict(self, record: Transaction) -> None:
+        # Se llama con el lock tomado. Se desaloja siempre el registro más
+        # antiguo: está al frente de sus índices
+        self._by_method[record.method].popleft()
+        self._by_status[record.status].popleft()
+        if self.spill_path is not None:
+            self._spill_buffer.append(
+                (record.seq, record.amount, record.description, record.method, record.status)
+            )
+            if len(self._spill_buffer) >= self._SPILL_BATCH:
+                self.flush()
+
+    def settle(self, record: Transaction, status: str) -> None:
+        """
+        Cambia el estado de un registro (p. ej. un pago "Pendiente" que se
+        confirmó). Los agregados se corrigen aunque el registro ya se haya
+        desalojado; lo escrito en disco conserva el estado que tenía.
+        """
+        with self._lock:
+            previous = record.status
+            if previous == status:
+                return
+            for key in ((None, previous), (record.method, previous)):
+                self._count[key] -= 1
+                self._sum[key] -= record.amount
+            for key in ((None, status), (record.method, status)):
+                self._count[key] += 1
+                self._sum[key] += record.amount
+            record.status = status
+            if self._get(record.seq) is record:
+                # Sigue en memoria: se mueve de índice manteniendo el orden por secuencia
+                self._by_status[previous].remove(record.seq)
+                bisect.insort(self._by_status[status], record.seq)
+
+    def flush(self) -> None:
+        """Escribe en disco los registros desalojados pendientes."""
+        with self._lock:
+            if self._spill_buffer and self.spill_path is not None:
+                with open(self.spill_path, "a", newline="", encoding="utf-8") as f:
+                    csv.writer(f).writerows(self._spill_buffer)
+                self._spill_buffer.clear()
+
+    def close(self) -> None:
+        """Escribe lo desalojado que quedó en el buffer; llamar al terminar."""
+        self.flush()
+
+    def __enter__(self) -> "TransactionLedger":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # Lectura
+
+    def _get(self, seq: int) -> Transaction:
+        return self._ring[seq % self.capacity]
+
+    def __len__(self) -> int:
+        """Registros en memoria."""
+        return min(self._next_seq, self.capacity)
+
+    @property
+    def total_count(self) -> int:
+        """Registros totales, incluidos los desalojados."""
+        return self._next_seq
+
+    def __iter__(self) -> Iterator[Transaction]:
+        """Registros en memoria, en orden cronológico (foto tomada al empezar)."""
+        with self._lock:
+            snapshot = [self._get(seq) for seq in range(self._next_seq - len(self), self._next_seq)]
+        return iter(snapshot)
+
+    def by_method(self, method: str) -> List[Transaction]:
+        with self._lock:
+            return [self._get(seq) for seq in self._by_method.get(method, ())]
+
+    def by_status(self, status: str) -> List[Transaction]:
+        with self._lock:
+            return [self._get(seq) for seq in self._by_status.get(status, ())]
+
+    def count(self, method: Optional[str] = None, status: Optional[str] = None) -> int:
+        with self._lock:
+            return self._count.get((method, status), 0)
+
+    def total(self, method: Optional[str] = None, status: Optional[str] = None) -> float:
+        with self._lock:
+            return self._sum.get((method, status), 0.0)
+
+    def methods(self) -> List[str]:
+        with self._lock:
+            return [method for method, status in self._count if method is not None and status is None]
+
+    def iter_all(self) -> Iterator[Transaction]:
+        """Historial completo: primero lo desalojado a disco y luego lo que está en memoria."""
+        with self._lock:
+            # Se fija hasta dónde leer el disco junto con la foto de memoria: lo
+            # que se desaloje después ya está en la foto y no se repite
+            self.flush()
+            try:
+                spilled_bytes = os.path.getsize(self.spill_path) if self.spill_path is not None else 0
+            except FileNotFoundError:
+                spilled_bytes = 0
+            in_memory = list(self)
+        if spilled_bytes:
+            with open(self.spill_path, "rb") as f:
+                for seq, amount, description, method, status in csv.reader(_lines_upto(f, spilled_bytes)):
+                    yield Transaction(int(seq), float(amount), description, method, status)
+        yield from in_memory
+
+
+def _lines_upto(f: BinaryIO, limit: int) -> Iterator[str]:
+    """Líneas de `f` (decodificadas) hasta `limit` bytes, sin cargar el archivo entero."""
+    for line in f:
+        if limit <= 0:
+            return
+        limit -= len(line)
+        yield line.decode("utf-8")
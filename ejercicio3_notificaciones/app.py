@@ -1,12 +1,23 @@
 # app.py
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
 from notifiers import (
     Notification,
     Notifier,
+    Priority,
     EmailNotifier,
     SMSNotifier,
     PushNotifier,
     SlackNotifier,
 )
+from coalescing import CoalescingNotifier
+from dispatcher import FanOutDispatcher
+from outbox import NotificationOutbox, OutboxFlusher, channel_name
+from priority_dispatcher import PriorityDispatcher
+from recipients import RecipientValidator
 
 
 # =========================
@@ -14,12 +25,17 @@ from notifiers import (
 # - Depende de la abstracción Notifier, no de clases concretas.
 # =========================
 class NotificationService:
-    def __init__(self, notifier: Notifier) -> None:
+    def __init__(self, notifier: Notifier, outbox: NotificationOutbox | None = None) -> None:
         self._notifier = notifier
+        self._outbox = outbox
 
-    def notify(self, to: str, title: str, body: str) -> None:
-        notification = Notification(to=to, title=title, body=body)
-        self._notifier.send(notification)
+    def notify(self, to: str, title: str, body: str, priority: Priority = Priority.NORMAL) -> None:
+        notification = Notification(to=to, title=title, body=body, priority=priority)
+        if self._outbox is not None:
+            # Modo outbox: queda guardada y la envía un OutboxFlusher
+            self._outbox.enqueue(channel_name(self._notifier), notification)
+        else:
+            self._notifier.send(notification)
 
 
 # =========================
@@ -27,18 +43,44 @@ class NotificationService:
 # (opcional, pero demuestra qué pasa si un canal falla)
 # =========================
 class MultiChannelNotificationService:
-    def __init__(self, notifiers: list[Notifier]) -> None:
+    def __init__(self, notifiers: list[Notifier], validator: RecipientValidator | None = None) -> None:
         self._notifiers = notifiers
+        # Con validador, los destinatarios inválidos se descartan antes de enviar (sin excepciones)
+        self._validator = validator
 
-    def notify_all(self, to: str, title: str, body: str) -> None:
-        notification = Notification(to=to, title=title, body=body)
+    def notify_all(self, to: str, title: str, body: str, priority: Priority = Priority.NORMAL) -> None:
+        notification = Notification(to=to, title=title, body=body, priority=priority)
 
         for notifier in self._notifiers:
+            if self._validator is not None and notifier.recipient_kind is not None:
+                normalized = self._validator.normalize(notifier.recipient_kind, to)
+                if normalized is None:
+                    print(f"[SKIP] Destinatario inválido para {notifier.__class__.__name__}: {to}")
+                    continue
+                channel_notification = Notification(to=normalized, title=title, body=body, priority=priority)
+            else:
+                channel_notification = notification
             try:
-                notifier.send(notification)
+                notifier.send(channel_notification)
             except Exception as e:
                 print(f"[WARN] Falló canal {notifier.__class__.__name__}: {e}")
 
+    def notify_many(
+        self, recipients: list[str], title: str, body: str, priority: Priority = Priority.NORMAL
+    ) -> None:
+        """Mismo mensaje a muchos destinatarios: filtra en bloque y envía con send_many."""
+        notifications = [Notification(to=to, title=title, body=body, priority=priority) for to in recipients]
+
+        for notifier in self._notifiers:
+            name = notifier.__class__.__name__
+            batch = notifications
+            if self._validator is not None and notifier.recipient_kind is not None:
+                batch, rejected = self._validator.filter(notifier.recipient_kind, notifications)
+                if rejected:
+                    print(f"[SKIP] {len(rejected)} destinatario(s) inválido(s) para {name}")
+            for _, e in notifier.send_many(batch):
+                print(f"[WARN] Falló canal {name}: {e}")
+
 
 # =========================
 # Demo
@@ -51,8 +93,8 @@ def demo() -> None:
     slack_service = NotificationService(SlackNotifier())
 
     email_service.notify("david@email.com", "Bienvenido", "Tu cuenta fue creada.")
-    push_service.notify("device_token_123", "Oferta", "Tienes 20% de descuento.")
-    slack_service.notify("#general", "Deploy", "Se desplegó la versión 1.2.0")
+    push_service.notify("device_token_123", "Oferta", "Tienes 20% de descuento.", priority=Priority.LOW)
+    slack_service.notify("#general", "Deploy", "Se desplegó la versión 1.2.0", priority=Priority.HIGH)
 
     # ¿Qué pasa si un canal falla? (SMS con número inválido)
     try:
@@ -71,6 +113,71 @@ def demo() -> None:
     print("\n--- Envío multicanal con tolerancia a fallos ---")
     multi.notify_all("3001234567", "Alerta", "Esto prueba fallo en SMS pero continúan los demás.")
 
+    # Con validación: cada canal recibe sólo destinatarios válidos para él, ya normalizados
+    print("\n--- Envío multicanal con validación de destinatarios ---")
+    validator = RecipientValidator()
+    validated = MultiChannelNotificationService([SMSNotifier(), EmailNotifier()], validator=validator)
+    validated.notify_all("+57 300 123 4567", "Código", "Tu código es 1234")
+    validated.notify_many(["+573001112233", "3001234567", "ana@Email.com"], "Aviso", "Mantenimiento a las 22:00")
+    print("Caché de destinatarios:", validator.stats())
+
+    # Ráfagas: la primera alerta sale en el momento; las repeticiones de la ventana, en un solo aviso
+    print("\n--- Alertas repetidas agrupadas ---")
+    coalescer = CoalescingNotifier(SlackNotifier(), window=60, digest_threshold=3)
+    alerts = NotificationService(coalescer)
+    for n in range(12):
+        alerts.notify("#ops", "CPU alta", f"web-{n % 2} al 90%")
+    alerts.notify("#ops", "Caída", "La API no responde.", priority=Priority.CRITICAL)
+    alerts.notify("#ops", "Caída", "La API no responde.", priority=Priority.CRITICAL)
+    for title in ("Disco lleno", "Latencia alta", "Error 500", "Cola atrasada"):
+        alerts.notify("#oncall", title, "Revisar dashboard")
+    coalescer.close()
+    print("Métricas:", coalescer.metrics())
+
+    # Prioridades: las ofertas (LOW) no le ganan el canal a una alerta crítica
+    print("\n--- Despacho por prioridad con límite por destinatario ---")
+    prioritized = PriorityDispatcher(PushNotifier(), recipient_rate=50, recipient_burst=2)
+    for n in range(3):
+        prioritized.submit(Notification(
+            to=f"device_token_{n}", title="Oferta", body="Tienes 20% de descuento.", priority=Priority.LOW
+        ))
+    prioritized.submit(Notification(to="device_token_ops", title="Caída", body="La API no responde.", priority=Priority.CRITICAL))
+    prioritized.submit(Notification(to="device_token_ops", title="Deploy", body="Versión 1.2.1 en curso.", priority=Priority.HIGH))
+    prioritized.submit(Notification(to="device_token_ops", title="Deploy", body="Versión 1.2.1 lista.", priority=Priority.HIGH))
+    prioritized.start()
+    prioritized.close()
+    print("Métricas:", prioritized.metrics())
+
+    # Fan-out: cada canal con su cola y sus hilos, no se esperan entre sí
+    print("\n--- Envío multicanal concurrente (fan-out) ---")
+    with FanOutDispatcher(
+        [EmailNotifier(), SMSNotifier(), PushNotifier(), SlackNotifier()],
+        queue_size=100,
+        workers={"SlackNotifier": 2},
+    ) as dispatcher:
+        dispatcher.dispatch(Notification(to="+573001234567", title="Alerta", body="Pedido #1 enviado."))
+        dispatcher.dispatch(Notification(to="3001234567", title="Alerta", body="Pedido #2 enviado."))
+        dispatcher.join()
+        for channel, stats in dispatcher.metrics().items():
+            print(
+                f"{channel}: enviados={stats['sent']} fallidos={stats['failed']} "
+                f"descartados={stats['dropped']} cola={stats['depth']} lag={stats['lag'] * 1000:.2f}ms"
+            )
+
+    # Outbox: se guarda primero (sobrevive reinicios) y se envía por lotes en segundo plano
+    print("\n--- Envío con outbox durable ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = NotificationOutbox(Path(tmp) / "outbox.db")
+        email, slack = EmailNotifier(), SlackNotifier()
+        flusher = OutboxFlusher(outbox, [email, slack])
+        flusher.start()
+        NotificationService(email, outbox=outbox).notify("david@email.com", "Factura", "Tu factura está lista.")
+        NotificationService(slack, outbox=outbox).notify("#ops", "Backup", "Backup nocturno completado.")
+        flusher.stop()
+        stats = flusher.stats()
+        outbox.close()
+        print(f"encoladas={stats['enqueued']} entregadas={stats['delivered']} pendientes={stats['pending']}")
+
 
 if __name__ == "__main__":
     demo()
@@ -0,0 +1,62 @@
+# bench_outbox.py
+# Throughput de encolado durable (group commit entre productores) y de vaciado de la outbox
+from __future__ import annotations
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from notifiers import Notification, Notifier
+from outbox import NotificationOutbox, OutboxFlusher, channel_name
+
+
+class NullNotifier(Notifier):
+    def send(self, notification: Notification) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--producers", type=int, nargs="+", default=[1, 4, 16, 64], help="hilos que encolan a la vez")
+    parser.add_argument("--flush-batch", type=int, default=200)
+    args = parser.parse_args()
+
+    notifier = NullNotifier()
+    channel = channel_name(notifier)
+    notifications = [
+        Notification(to=f"user{n % 5000}@email.com", title="Alerta", body=f"Evento {n}")
+        for n in range(args.count)
+    ]
+
+    for count in args.producers:
+        with tempfile.TemporaryDirectory() as tmp:
+            outbox = NotificationOutbox(Path(tmp) / "outbox.db")
+            # Cada enqueue espera su fsync: con más productores cada commit cubre más filas
+            producers = [
+                threading.Thread(target=lambda share: [outbox.enqueue(channel, n) for n in share],
+                                 args=(notifications[k::count],))
+                for k in range(count)
+            ]
+            start = time.perf_counter()
+            for producer in producers:
+                producer.start()
+            for producer in producers:
+                producer.join()
+            enqueue = time.perf_counter() - start
+
+            flusher = OutboxFlusher(outbox, [notifier], batch_size=args.flush_batch)
+            start = time.perf_counter()
+            while flusher.flush_once():
+                pass
+            flush = time.perf_counter() - start
+            outbox.close()
+        print(
+            f"productores={count:<4} encolado {args.count / enqueue:>10,.0f}/s  "
+            f"vaciado {args.count / flush:>10,.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
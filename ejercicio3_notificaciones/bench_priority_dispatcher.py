@@ -0,0 +1,58 @@
+# bench_priority_dispatcher.py
+# Costo de scheduling por mensaje (submit + next_ready) del PriorityDispatcher; objetivo < 10µs
+from __future__ import annotations
+import argparse
+import random
+import time
+
+from notifiers import Notification, Notifier, Priority
+from priority_dispatcher import PriorityDispatcher
+
+
+class NullNotifier(Notifier):
+    def send(self, notification: Notification) -> None:
+        pass
+
+
+def workload(count: int, recipients: int, noisy_share: float, seed: int = 3) -> list[Notification]:
+    rng = random.Random(seed)
+    priorities = list(Priority)
+    out = []
+    for n in range(count):
+        to = "noisy" if rng.random() < noisy_share else f"user{rng.randrange(recipients)}"
+        out.append(Notification(to=to, title="Aviso", body=str(n), priority=rng.choice(priorities)))
+    return out
+
+
+def measure(label: str, notifications: list[Notification], **options) -> None:
+    dispatcher = PriorityDispatcher(NullNotifier(), max_pending=len(notifications) + 1, **options)
+    next_ready = dispatcher.next_ready
+    start = time.perf_counter()
+    for notification in notifications:
+        dispatcher.submit(notification)
+    scheduled = 0
+    while next_ready() is not None:
+        scheduled += 1
+    elapsed = time.perf_counter() - start
+    metrics = dispatcher.metrics()
+    print(
+        f"{label:<40} {elapsed / len(notifications) * 1e6:6.2f} µs/msg  "
+        f"programados={scheduled:,} apartados={metrics['parked']:,} enviados={metrics['sent']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--recipients", type=int, default=10_000)
+    args = parser.parse_args()
+
+    plain = workload(args.count, args.recipients, noisy_share=0.0)
+    noisy = workload(args.count, args.recipients, noisy_share=0.3)
+    measure("sólo WFQ", plain)
+    measure("WFQ + buckets canal/destinatario", plain, channel_rate=1e9, recipient_rate=1e6)
+    measure("WFQ + buckets, 30% destinatario ruidoso", noisy, channel_rate=1e9, recipient_rate=10, recipient_burst=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# bench_recipients.py
+# Descartar destinatarios inválidos: excepción en send vs validación con caché antes de despachar
+from __future__ import annotations
+import argparse
+import random
+import time
+
+from notifiers import Notification, SMSNotifier
+from recipients import PHONE, RecipientValidator
+
+
+class QuietSMSNotifier(SMSNotifier):
+    """Misma validación que SMSNotifier.send, sin imprimir; cada intento cuesta `attempt` segundos."""
+
+    def __init__(self, attempt: float) -> None:
+        self.attempt = attempt
+
+    def send(self, notification: Notification) -> None:
+        deadline = time.perf_counter() + self.attempt
+        while time.perf_counter() < deadline:
+            pass
+        if not notification.to.startswith("+"):
+            raise RuntimeError("Número inválido para SMS (debe empezar con +).")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--invalid", type=float, default=0.2, help="fracción de números inválidos")
+    parser.add_argument("--distinct", type=int, default=5000, help="destinatarios distintos")
+    parser.add_argument("--attempt-us", type=float, default=10.0, help="costo de cada intento contra el proveedor")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    pool = [
+        f"300{n:07d}" if rng.random() < args.invalid else f"+57300{n:07d}"
+        for n in range(args.distinct)
+    ]
+    notifications = [Notification(to=rng.choice(pool), title="Código", body="1234") for _ in range(args.count)]
+    notifier = QuietSMSNotifier(args.attempt_us / 1e6)
+
+    start = time.perf_counter()
+    errors = 0
+    for notification in notifications:
+        try:
+            notifier.send(notification)
+        except Exception:
+            errors += 1
+    baseline = time.perf_counter() - start
+    print(f"excepción en send       {args.count / baseline:>12,.0f}/s  descartadas={errors:,}")
+
+    validator = RecipientValidator()
+    start = time.perf_counter()
+    valid, rejected = validator.filter(PHONE, notifications)
+    for notification in valid:
+        notifier.send(notification)
+    validated = time.perf_counter() - start
+    print(f"validación + caché      {args.count / validated:>12,.0f}/s  descartadas={len(rejected):,}")
+    print("Caché:", validator.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bench_send_many.py
+# send uno por uno vs el send_many de cada canal incluido, contra un proveedor falso con costo fijo por llamado
+from __future__ import annotations
+import argparse
+import time
+
+from notifiers import EmailNotifier, Notification, Notifier, PushNotifier, SlackNotifier, SMSNotifier
+
+
+class FakeProvider:
+    """Simula una API remota: cada llamado cuesta `call_overhead` segundos más un poco por destinatario."""
+
+    def __init__(self, call_overhead: float, per_recipient: float) -> None:
+        self.call_overhead = call_overhead
+        self.per_recipient = per_recipient
+        self.calls = 0
+        self.recipients = 0
+
+    def call(self, recipients: list[str], title: str, body: str) -> None:
+        self.calls += 1
+        self.recipients += len(recipients)
+        deadline = time.perf_counter() + self.call_overhead + self.per_recipient * len(recipients)
+        while time.perf_counter() < deadline:
+            pass
+
+
+def against(notifier_cls: type[Notifier], provider: FakeProvider) -> Notifier:
+    """El canal tal cual se distribuye, pero con `_deliver` apuntando al proveedor falso."""
+    notifier = notifier_cls()
+    notifier._deliver = provider.call
+    return notifier
+
+
+def one_by_one(notifier: Notifier, notifications: list[Notification]) -> int:
+    failures = 0
+    for notification in notifications:
+        try:
+            notifier.send(notification)
+        except Exception:
+            failures += 1
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--messages", type=int, default=10, help="mensajes distintos (título/cuerpo)")
+    parser.add_argument("--call-overhead-us", type=float, default=50.0)
+    parser.add_argument("--per-recipient-us", type=float, default=0.5)
+    args = parser.parse_args()
+
+    overhead = args.call_overhead_us / 1e6
+    per_recipient = args.per_recipient_us / 1e6
+    destinations = {
+        EmailNotifier: "user{}@email.com",
+        SMSNotifier: "+54911{:07d}",
+        PushNotifier: "device_{}",
+        SlackNotifier: "@user{}",
+    }
+
+    for notifier_cls, destination in destinations.items():
+        notifications = [
+            Notification(to=destination.format(n), title=f"Aviso {n % args.messages}", body="Hay novedades en tu cuenta.")
+            for n in range(args.count)
+        ]
+        results = []
+        for name, run in (
+            ("send (uno por uno)", one_by_one),
+            ("send_many", lambda notifier, batch: len(notifier.send_many(batch))),
+        ):
+            provider = FakeProvider(overhead, per_recipient)
+            start = time.perf_counter()
+            failures = run(against(notifier_cls, provider), notifications)
+            elapsed = time.perf_counter() - start
+            results.append(elapsed)
+            print(
+                f"{notifier_cls.__name__:<14} {name:<20} {elapsed:7.2f}s  "
+                f"{args.count / elapsed:>12,.0f} notificaciones/s  llamados={provider.calls:,} fallos={failures}"
+            )
+        single, bulk = results
+        print(f"{notifier_cls.__name__:<14} aceleración: {single / bulk:.1f}x (bulk_size={notifier_cls.bulk_size})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+# coalescing.py
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+from notifiers import Failures, Notification, Notifier, Priority
+
+
+_DIGITS = re.compile(r"\d+")
+_SPACES = re.compile(r"\s+")
+
+# Cuerpos distintos que se conservan por clave al fusionar
+_MAX_BODIES = 5
+
+
+def fingerprint(notification: Notification) -> Hashable:
+    """Clave por defecto: sólo duplicados exactos (destinatario, título y cuerpo)."""
+    return notification.to, notification.title, notification.body
+
+
+def near_duplicate_fingerprint(notification: Notification) -> Hashable:
+    """
+    Clave de casi-duplicados (opcional): mismo destinatario y título, y el
+    cuerpo sin números ni espacios repetidos ("Pedido 1 falló" ~ "Pedido 2 falló").
+    """
+    body = _SPACES.sub(" ", _DIGITS.sub("#", notification.body)).strip().lower()
+    return notification.to, notification.title, body
+
+
+class _Entry:
+    """Una clave en una ventana: si su primera aparición ya salió y lo retenido desde entonces."""
+
+    __slots__ = ("notification", "sent", "count", "priority", "bodies", "truncated")
+
+    def __init__(self, notification: Notification, sent: bool) -> None:
+        self.notification = notification
+        self.sent = sent
+        self.count = 0
+        self.priority = notification.priority
+        self.bodies: list[str] = []
+        self.truncated = False
+        if not sent:
+            self.hold(notification)
+
+    def hold(self, notification: Notification) -> None:
+        self.count += 1
+        if notification.priority > self.priority:
+            self.priority = notification.priority
+        if notification.body not in self.bodies:
+            if len(self.bodies) < _MAX_BODIES:
+                self.bodies.append(notification.body)
+            else:
+                self.truncated = True
+
+    def text(self) -> str:
+        text = " / ".join(self.bodies) + (" / …" if self.truncated else "")
+        if self.sent:
+            return f"{text} (+{self.count} repeticiones)"
+        return _with_count(text, self.count)
+
+
+class _Window:
+    __slots__ = ("entries", "sent_to")
+
+    def __init__(self) -> None:
+        self.entries: dict[Hashable, _Entry] = {}
+        # Mensajes ya enviados en el momento por destinatario
+        self.sent_to: dict[str, int] = {}
+
+
+# =========================
+# Decorador: agrupa repetidas por ventana de tiempo
+# =========================
+class CoalescingNotifier(Notifier):
+    """
+    Deja pasar en el momento la primera aparición de cada clave (ver
+    `fingerprint`) en ventanas fijas de `window` segundos y retiene sólo las
+    repeticiones: al cerrar la ventana envía un único aviso por clave con la
+    cantidad y los cuerpos distintos que se fusionaron. Las CRITICAL no se
+    agrupan nunca.
+
+    La clave por defecto sólo junta duplicados exactos; para juntar
+    casi-duplicados se pasa `key=near_duplicate_fingerprint`.
+
+    Cada destinatario recibe en el momento a lo sumo `digest_threshold`
+    mensajes distintos por ventana; los demás se retienen, y si al cerrar la
+    ventana le quedan `digest_threshold` avisos o más recibe un único resumen
+    ("12 alertas en los últimos 60s") en vez de uno por clave.
+
+    El índice es un dict por ventana (bucket = int(ahora / window)). La
+    memoria está acotada por `max_keys`: si se supera, la ventana más vieja
+    se envía antes de tiempo. Las ventanas vencidas se envían desde un hilo de
+    fondo (salvo `background=False`), en cada `send` y con `flush()`.
+    """
+
+    def __init__(
+        self,
+        notifier: Notifier,
+        window: float = 60.0,
+        digest_threshold: int = 5,
+        max_keys: int = 100_000,
+        key: Callable[[Notification], Hashable] = fingerprint,
+        clock: Callable[[], float] = time.monotonic,
+        background: bool = True,
+    ) -> None:
+        self._notifier = notifier
+        self.recipient_kind = notifier.recipient_kind
+        self._window = window
+        self._digest_threshold = digest_threshold
+        self._max_keys = max_keys
+        self._key = key
+        self._clock = clock
+        self._buckets: OrderedDict[int, _Window] = OrderedDict()
+        self._size = 0
+        self._held = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.received = 0
+        self.emitted = 0
+        self.bypassed = 0
+        self.digests = 0
+        self.early_flushes = 0
+        if background:
+            self.start()
+
+    def send(self, notification: Notification) -> None:
+        if notification.priority >= Priority.CRITICAL:
+            with self._lock:
+                self.received += 1
+                self.emitted += 1
+                self.bypassed += 1
+            self._deliver([notification])
+            return
+
+        now_bucket = int(self._clock() / self._window)
+        key = self._key(notification)
+        with self._lock:
+            self.received += 1
+            window = self._buckets.get(now_bucket)
+            if window is None:
+                window = self._buckets[now_bucket] = _Window()
+            entry = window.entries.get(key)
+            if entry is not None:
+                entry.hold(notification)
+                self._held += 1
+                return
+            to = notification.to
+            immediate = window.sent_to.get(to, 0) < self._digest_threshold
+            window.entries[key] = _Entry(notification, sent=immediate)
+            self._size += 1
+            if immediate:
+                window.sent_to[to] = window.sent_to.get(to, 0) + 1
+                self.emitted += 1
+            else:
+                self._held += 1
+            due = self._take_expired(now_bucket)
+            while self._size > self._max_keys:
+                due.append(self._pop_oldest())
+                self.early_flushes += 1
+            outgoing = ([notification] if immediate else []) + self._render(due)
+        if outgoing:
+            self._deliver(outgoing)
+
+    def send_many(self, notifications: Iterable[Notification]) -> Failures:
+        for notification in notifications:
+            self.send(notification)
+        return []
+
+    # Vaciado de ventanas
+
+    def _pop_oldest(self) -> _Window:
+        _, window = self._buckets.popitem(last=False)
+        self._size -= len(window.entries)
+        self._held -= sum(entry.count for entry in window.entries.values())
+        return window
+
+    def _take_expired(self, now_bucket: int) -> list[_Window]:
+        # Se llama con el lock tomado
+        expired = []
+        while self._buckets and next(iter(self._buckets)) < now_bucket:
+            expired.append(self._pop_oldest())
+        return expired
+
+    def _render(self, windows: list[_Window]) -> list[Notification]:
+        # Se llama con el lock tomado: lo retenido (repeticiones y mensajes que
+        # no salieron en el momento) como un aviso por clave o un resumen
+        by_recipient: dict[str, list[_Entry]] = {}
+        for window in windows:
+            for entry in window.entries.values():
+                if entry.count:
+                    by_recipient.setdefault(entry.notification.to, []).append(entry)
+        out = []
+        for to, entries in by_recipient.items():
+            if len(entries) >= self._digest_threshold:
+                total = sum(entry.count for entry in entries)
+                lines = [f"{entry.notification.title}: {entry.text()}" for entry in entries]
+                out.append(Notification(
+                    to=to,
+                    title=f"{total} alertas en los últimos {self._window:g}s",
+                    body="; ".join(lines),
+                    priority=max(entry.priority for entry in entries),
+                ))
+                self.digests += 1
+            else:
+                for entry in entries:
+                    n = entry.notification
+                    out.append(n if entry.count == 1 and not entry.sent else Notification(
+                        to=n.to, title=n.title, body=entry.text(), priority=entry.priority
+                    ))
+        self.emitted += len(out)
+        return out
+
+    def _deliver(self, notifications: list[Notification]) -> Failures:
+        failures = self._notifier.send_many(notifications)
+        for _, e in failures:
+            print(f"[WARN] Falló canal {self._notifier.__class__.__name__}: {e}")
+        return failures
+
+    def flush(self, force: bool = False) -> Failures:
+        """Envía las ventanas vencidas (o todas, con `force`)."""
+        with self._lock:
+            if force:
+                due = [self._pop_oldest() for _ in range(len(self._buckets))]
+            else:
+                due = self._take_expired(int(self._clock() / self._window))
+            outgoing = self._render(due)
+        return self._deliver(outgoing) if outgoing else []
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def start(self, interval: float | None = None) -> None:
+        """Vacía las ventanas vencidas en segundo plano (por defecto cada window/4)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval or self._window / 4,), name="coalescer", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Detiene el hilo y envía todo lo retenido."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush(force=True)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "received": self.received,
+                "emitted": self.emitted,
+                # Recibidas que no generaron un mensaje propio (fusionadas o en un resumen)
+                "suppressed": self.received - self.emitted - self._held,
+                "held": self._held,
+                "bypassed": self.bypassed,
+                "held_keys": self._size,
+                "digests": self.digests,
+                "early_flushes": self.early_flushes,
+            }
+
+
+def _with_count(text: str, count: int) -> str:
+    return text if count == 1 else f"{text} (x{count})"
@@ -0,0 +1,175 @@
+# dispatcher.py
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Iterable
+
+from notifiers import Notification, Notifier
+
+
+BLOCK = "block"
+DROP = "drop"
+
+_STOP = object()
+
+
+# =========================
+# Canal: cola acotada + hilos propios
+# =========================
+class _Channel:
+    def __init__(self, name: str, notifier: Notifier, queue_size: int, workers: int) -> None:
+        self.name = name
+        self.notifier = notifier
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._work, name=f"{name}-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                notification, enqueued_at = item
+                lag = time.monotonic() - enqueued_at
+                try:
+                    self.notifier.send(notification)
+                    ok = True
+                except Exception as e:
+                    ok = False
+                    print(f"[WARN] Falló canal {self.name}: {e}")
+                with self._lock:
+                    self.last_lag = lag
+                    self.max_lag = max(self.max_lag, lag)
+                    if ok:
+                        self.sent += 1
+                    else:
+                        self.failed += 1
+            finally:
+                self.queue.task_done()
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "depth": self.queue.qsize(),
+                "lag": self.last_lag,
+                "max_lag": self.max_lag,
+                "sent": self.sent,
+                "failed": self.failed,
+                "dropped": self.dropped,
+            }
+
+
+# =========================
+# Dispatcher fan-out
+# - Cada notifier tiene su cola y sus hilos: un canal lento sólo se frena a sí mismo.
+# =========================
+class FanOutDispatcher:
+    """
+    Reparte cada notificación a todos los canales sin esperar a que se envíe.
+
+    Primero se encola en todos los canales con lugar; sólo después se atiende
+    a los llenos, así un canal trabado no demora la entrega a los demás. Si la
+    cola de un canal está llena:
+    - policy="block": quien despacha espera, como mucho `block_timeout`
+      segundos en total para todos los canales llenos; lo que no entró se
+      descarta y se cuenta en `dropped`.
+    - policy="drop": se descarta de inmediato y se cuenta en `dropped`.
+
+    `workers` puede ser un entero (igual para todos) o un dict nombre -> hilos,
+    útil para darle más hilos a un canal lento.
+    """
+
+    def __init__(
+        self,
+        notifiers: Iterable[Notifier],
+        queue_size: int = 1000,
+        workers: int | dict[str, int] = 1,
+        policy: str = BLOCK,
+        block_timeout: float = 1.0,
+    ) -> None:
+        if policy not in (BLOCK, DROP):
+            raise ValueError(f"policy debe ser '{BLOCK}' o '{DROP}'")
+        if block_timeout is None or block_timeout < 0:
+            raise ValueError("block_timeout debe ser >= 0 (nunca se espera sin límite)")
+        self._policy = policy
+        self._block_timeout = block_timeout
+        self._channels: list[_Channel] = []
+        names: set[str] = set()
+        for notifier in notifiers:
+            name = notifier.__class__.__name__
+            n = 2
+            while name in names:
+                name = f"{notifier.__class__.__name__}#{n}"
+                n += 1
+            names.add(name)
+            count = workers.get(name, 1) if isinstance(workers, dict) else workers
+            self._channels.append(_Channel(name, notifier, queue_size, max(1, count)))
+        self._closed = False
+
+    def dispatch(self, notification: Notification) -> dict[str, bool]:
+        """Encola en todos los canales; devuelve qué canales la aceptaron."""
+        if self._closed:
+            raise RuntimeError("Dispatcher cerrado.")
+        now = time.monotonic()
+        item = (notification, now)
+        accepted = {}
+        full = []
+        for channel in self._channels:
+            try:
+                channel.queue.put_nowait(item)
+                accepted[channel.name] = True
+            except queue.Full:
+                full.append(channel)
+
+        deadline = now + self._block_timeout
+        for channel in full:
+            try:
+                if self._policy != BLOCK:
+                    raise queue.Full
+                # Un solo plazo para todos los llenos: la espera no se suma por canal
+                channel.queue.put(item, timeout=max(0.0, deadline - time.monotonic()))
+                accepted[channel.name] = True
+            except queue.Full:
+                with channel._lock:
+                    channel.dropped += 1
+                accepted[channel.name] = False
+        return accepted
+
+    def join(self) -> None:
+        """Espera a que todos los canales vacíen su cola."""
+        for channel in self._channels:
+            channel.queue.join()
+
+    def close(self) -> None:
+        """Termina de enviar lo encolado y detiene los hilos."""
+        if self._closed:
+            return
+        self._closed = True
+        for channel in self._channels:
+            for _ in channel.threads:
+                channel.queue.put(_STOP)
+        for channel in self._channels:
+            for thread in channel.threads:
+                thread.join()
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {channel.name: channel.metrics() for channel in self._channels}
+
+    def __enter__(self) -> FanOutDispatcher:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
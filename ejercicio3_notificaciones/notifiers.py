@@ -2,49 +2,165 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from enum import IntEnum
+from typing import Callable, Iterable, Iterator
 
 
 # =========================
 # Modelo de mensaje
 # =========================
+class Priority(IntEnum):
+    LOW = 0       # marketing, ofertas
+    NORMAL = 1
+    HIGH = 2      # deploys, avisos operativos
+    CRITICAL = 3  # alertas, códigos de acceso
+
+
 @dataclass(frozen=True)
 class Notification:
     to: str
     title: str
     body: str
+    priority: Priority = Priority.NORMAL
+
+
+# Resultado de send_many: (notificación, error) por cada una que falló
+Failures = list[tuple[Notification, Exception]]
 
 
 # =========================
 # Interfaz (ISP)
 # =========================
 class Notifier(ABC):
+    # Tipo de destinatario que acepta el canal (ver recipients.py); None = sin validar
+    recipient_kind: str | None = None
+
     @abstractmethod
     def send(self, notification: Notification) -> None:
         """Envía una notificación por un canal."""
         ...
 
+    def send_many(self, notifications: Iterable[Notification]) -> Failures:
+        """
+        Envía varias notificaciones; un fallo no detiene a las demás.
+        Por defecto llama a send una por una; los canales con API masiva lo redefinen.
+        """
+        failures: Failures = []
+        for notification in notifications:
+            try:
+                self.send(notification)
+            except Exception as e:
+                failures.append((notification, e))
+        return failures
+
+
+# =========================
+# Envío masivo: un llamado por grupo de destinatarios con el mismo mensaje
+# =========================
+def group_by_message(
+    notifications: Iterable[Notification], bulk_size: int
+) -> Iterator[tuple[str, str, list[Notification]]]:
+    """(título, cuerpo, notificaciones) con hasta `bulk_size` notificaciones por grupo."""
+    groups: dict[tuple[str, str], list[Notification]] = {}
+    for notification in notifications:
+        groups.setdefault((notification.title, notification.body), []).append(notification)
+    for (title, body), group in groups.items():
+        for start in range(0, len(group), bulk_size):
+            yield title, body, group[start:start + bulk_size]
+
+
+def deliver_groups(
+    deliver: Callable[[list[str], str, str], None],
+    notifications: Iterable[Notification],
+    bulk_size: int,
+) -> Failures:
+    """
+    Llama a `deliver(destinatarios, título, cuerpo)` por grupo. Si un llamado
+    falla, sólo las notificaciones de ese grupo se reportan como fallidas: las
+    de los grupos ya entregados no se reenvían al reintentar.
+    """
+    failures: Failures = []
+    for title, body, group in group_by_message(notifications, bulk_size):
+        try:
+            deliver([notification.to for notification in group], title, body)
+        except Exception as e:
+            failures.extend((notification, e) for notification in group)
+    return failures
+
 
 # =========================
 # Implementaciones (SRP)
+# - Cada canal habla con su proveedor sólo en `_deliver` (un llamado a la API,
+#   acá simulado con print); bench_send_many.py lo redirige a un proveedor falso.
 # =========================
 class EmailNotifier(Notifier):
+    recipient_kind = "email"
+    bulk_size = 1000
+
     def send(self, notification: Notification) -> None:
-        print(f"[Email] To: {notification.to} | {notification.title} -> {notification.body}")
+        self._deliver([notification.to], notification.title, notification.body)
+
+    def send_many(self, notifications: Iterable[Notification]) -> Failures:
+        return deliver_groups(self._deliver, notifications, self.bulk_size)
+
+    def _deliver(self, recipients: list[str], title: str, body: str) -> None:
+        header = "To" if len(recipients) == 1 else "Bcc"
+        print(f"[Email] {header}: {', '.join(recipients)} | {title} -> {body}")
 
 
 class SMSNotifier(Notifier):
+    recipient_kind = "phone"
+    bulk_size = 1000
+
     def send(self, notification: Notification) -> None:
         # Simulación de fallo si el número es inválido
         if not notification.to.startswith("+"):
             raise RuntimeError("Número inválido para SMS (debe empezar con +).")
-        print(f"[SMS] To: {notification.to} | {notification.title} -> {notification.body}")
+        self._deliver([notification.to], notification.title, notification.body)
+
+    def send_many(self, notifications: Iterable[Notification]) -> Failures:
+        valid: list[Notification] = []
+        failures: Failures = []
+        for notification in notifications:
+            if notification.to.startswith("+"):
+                valid.append(notification)
+            else:
+                failures.append((notification, RuntimeError("Número inválido para SMS (debe empezar con +).")))
+        failures.extend(deliver_groups(self._deliver, valid, self.bulk_size))
+        return failures
+
+    def _deliver(self, recipients: list[str], title: str, body: str) -> None:
+        print(f"[SMS] To: {', '.join(recipients)} | {title} -> {body}")
 
 
 class PushNotifier(Notifier):
+    recipient_kind = "device"
+    # Como el multicast de FCM: hasta 500 dispositivos por llamado
+    bulk_size = 500
+
     def send(self, notification: Notification) -> None:
-        print(f"[Push] To: {notification.to} | {notification.title} -> {notification.body}")
+        self._deliver([notification.to], notification.title, notification.body)
+
+    def send_many(self, notifications: Iterable[Notification]) -> Failures:
+        return deliver_groups(self._deliver, notifications, self.bulk_size)
+
+    def _deliver(self, recipients: list[str], title: str, body: str) -> None:
+        if len(recipients) == 1:
+            print(f"[Push] To: {recipients[0]} | {title} -> {body}")
+        else:
+            print(f"[Push] Multicast ({len(recipients)}): {', '.join(recipients)} | {title} -> {body}")
 
 
 class SlackNotifier(Notifier):
+    recipient_kind = "slack"
+    bulk_size = 100
+
     def send(self, notification: Notification) -> None:
-        print(f"[Slack] Channel/User: {notification.to} | {notification.title} -> {notification.body}")
+        self._deliver([notification.to], notification.title, notification.body)
+
+    def send_many(self, notifications: Iterable[Notification]) -> Failures:
+        return deliver_groups(self._deliver, notifications, self.bulk_size)
+
+    def _deliver(self, recipients: list[str], title: str, body: str) -> None:
+        header = "Channel/User" if len(recipients) == 1 else "Channels/Users"
+        print(f"[Slack] {header}: {', '.join(recipients)} | {title} -> {body}")
@@ -0,0 +1,330 @@
+# outbox.py
+# Bandeja de salida durable (sqlite3 de la librería estándar)
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from notifiers import Notification, Notifier, Priority
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel   TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    title     TEXT NOT NULL,
+    body      TEXT NOT NULL,
+    created   REAL NOT NULL,
+    priority  INTEGER NOT NULL DEFAULT 1,
+    attempts  INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+# Se crean después de _migrate: una base vieja recién ahí tiene la columna priority.
+# fetch recorre el índice en el orden de su ORDER BY (sin ordenar aparte).
+_INDEXES = """
+DROP INDEX IF EXISTS idx_outbox_channel;
+CREATE INDEX IF NOT EXISTS idx_outbox_channel_priority ON outbox (channel, priority DESC, id);
+"""
+
+# Columnas agregadas después de la primera versión: una base vieja las recibe con ALTER TABLE
+_ADDED_COLUMNS = {
+    "priority": "INTEGER NOT NULL DEFAULT 1",
+    "next_attempt_at": "REAL NOT NULL DEFAULT 0",
+}
+
+_INSERT = "INSERT INTO outbox (channel, recipient, title, body, created, priority) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+def channel_name(notifier: Notifier) -> str:
+    return notifier.__class__.__name__
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}
+    for name, definition in _ADDED_COLUMNS.items():
+        if name not in columns:
+            conn.execute(f"ALTER TABLE outbox ADD COLUMN {name} {definition}")
+
+
+# =========================
+# Outbox: cola durable con group commit
+# =========================
+class NotificationOutbox:
+    """
+    Cola durable de notificaciones en SQLite (modo WAL, synchronous=FULL).
+
+    `enqueue` retorna recién cuando su fila está escrita y sincronizada.
+    Group commit: las filas que llegan mientras otro hilo escribe forman el
+    lote siguiente, y el primero que espera lo escribe entero con
+    `executemany` en una sola transacción (un solo fsync). Con
+    `commit_interval` > 0 ese hilo espera hasta ese tiempo (o hasta juntar
+    `batch_size` filas) para armar lotes más grandes.
+
+    Las filas se borran recién después de enviarse: si el proceso cae entre el
+    envío y el borrado, se reenvían al reiniciar (entrega al-menos-una-vez).
+    Un envío fallido se reprograma con espera exponencial (`retry_delay`,
+    duplicándose hasta `max_retry_delay`) en `next_attempt_at`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        batch_size: int = 500,
+        commit_interval: float = 0.0,
+        max_attempts: int = 5,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 300.0,
+    ) -> None:
+        self._batch_size = batch_size
+        self._commit_interval = commit_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        # Estado del group commit (protegido por _group); la conexión, por _lock
+        self._group = threading.Condition()
+        self._pending: list[tuple] = []
+        self._first_pending = 0.0
+        self._batch = 0  # número del lote que se está llenando
+        self._written = -1  # último lote escrito
+        self._writing = False
+        self._joined = 0  # llamadas a enqueue_many que esperan el lote que se llena
+        # Error de un lote fallido y cuántas llamadas todavía no lo leyeron
+        self._errors: dict[int, list[Any]] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(Path(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        _migrate(self._conn)
+        self._conn.executescript(_INDEXES)
+        self.enqueued = 0
+        self.enqueue_seconds = 0.0
+
+    def enqueue(self, channel: str, notification: Notification) -> None:
+        """Guarda la notificación; al retornar ya está en disco."""
+        self.enqueue_many(channel, [notification])
+
+    def enqueue_many(self, channel: str, notifications: Iterable[Notification]) -> None:
+        """Guarda varias notificaciones en el mismo lote; al retornar están en disco."""
+        start = time.perf_counter()
+        now = time.time()
+        rows = [
+            (channel, n.to, n.title, n.body, now, int(n.priority)) for n in notifications
+        ]
+        with self._group:
+            if not self._pending:
+                self._first_pending = time.monotonic()
+            self._pending += rows
+            batch = self._batch
+            self._joined += 1
+            while self._written < batch:
+                if self._writing or self._batch != batch:
+                    # Otro hilo está escribiendo (quizá nuestro lote): se espera su aviso
+                    self._group.wait(self._commit_interval or None)
+                    continue
+                wait = self._first_pending + self._commit_interval - time.monotonic()
+                if wait > 0 and len(self._pending) < self._batch_size:
+                    self._group.wait(wait)
+                    continue
+                self._write_batch()
+            failed = self._errors.get(batch)
+            if failed is not None:
+                # La última llamada del lote en leer el error lo descarta
+                failed[1] -= 1
+                if not failed[1]:
+                    del self._errors[batch]
+                raise failed[0]
+            self.enqueued += len(rows)
+            self.enqueue_seconds += time.perf_counter() - start
+
+    def _write_batch(self) -> None:
+        # Se llama con _group tomado; lo suelta mientras escribe para que el
+        # lote siguiente se siga llenando
+        rows, self._pending = self._pending, []
+        joined, self._joined = self._joined, 0
+        batch = self._batch
+        self._batch += 1
+        self._writing = True
+        self._group.release()
+        try:
+            if rows:
+                with self._lock, self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.executemany(_INSERT, rows)
+        except BaseException as error:
+            if joined:
+                self._errors[batch] = [error, joined]
+        finally:
+            self._group.acquire()
+            self._writing = False
+            self._written = batch
+            self._group.notify_all()
+
+    def commit(self) -> None:
+        """Escribe ya lo que esté esperando su lote (lo usa el flusher al vaciar)."""
+        with self._group:
+            while self._writing:
+                self._group.wait()
+            if self._pending:
+                self._write_batch()
+
+    # Lado del flusher
+
+    def fetch(self, channel: str, limit: int) -> list[tuple[int, Notification]]:
+        """
+        Hasta `limit` notificaciones del canal cuyo reintento ya venció: primero
+        las de mayor prioridad y, dentro de cada prioridad, las más antiguas.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, recipient, title, body, priority FROM outbox "
+                "WHERE channel = ? AND attempts < ? AND next_attempt_at <= ? "
+                "ORDER BY priority DESC, id LIMIT ?",
+                (channel, self.max_attempts, time.time(), limit),
+            ).fetchall()
+        return [
+            (row_id, Notification(to=to, title=title, body=body, priority=Priority(priority)))
+            for row_id, to, title, body, priority in rows
+        ]
+
+    def ack(self, ids: list[int]) -> None:
+        """Marca como entregadas (las borra)."""
+        if ids:
+            with self._lock, self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def retry_later(self, ids: list[int]) -> None:
+        """
+        Suma un intento y reprograma la fila para dentro de
+        `retry_delay * 2**intentos` segundos (a lo sumo `max_retry_delay`);
+        tras `max_attempts` queda apartada (no se reintenta).
+        """
+        if ids:
+            with self._lock, self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "UPDATE outbox SET attempts = attempts + 1, "
+                    "next_attempt_at = ? + min(?, ? * (1 << attempts)) WHERE id = ?",
+                    [(time.time(), self.max_retry_delay, self.retry_delay, i) for i in ids],
+                )
+
+    def pending_count(self) -> int:
+        self.commit()
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE attempts < ?", (self.max_attempts,)
+            ).fetchone()
+        return count
+
+    def dead_count(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE attempts >= ?", (self.max_attempts,)
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        self.commit()
+        with self._lock:
+            self._conn.close()
+
+
+# =========================
+# Flusher: vacía la outbox por lotes hacia cada notifier
+# =========================
+class OutboxFlusher:
+    """
+    Hilo de fondo que entrega lotes de hasta `batch_size` notificaciones a
+    cada notifier registrado con un solo `send_many`. Si la outbox queda vacía
+    duerme `interval` segundos. Si `send_many` lanza, todo el lote se
+    reprograma y el hilo sigue.
+    """
+
+    def __init__(
+        self,
+        outbox: NotificationOutbox,
+        notifiers: Iterable[Notifier],
+        batch_size: int = 200,
+        interval: float = 0.05,
+    ) -> None:
+        self._outbox = outbox
+        self._notifiers = {channel_name(notifier): notifier for notifier in notifiers}
+        self._batch_size = batch_size
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.delivered = 0
+        self.failed = 0
+        self.flush_seconds = 0.0
+
+    def flush_once(self) -> int:
+        """Entrega un lote por canal; devuelve cuántas notificaciones procesó."""
+        processed = 0
+        for channel, notifier in self._notifiers.items():
+            batch = self._outbox.fetch(channel, self._batch_size)
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                failures = notifier.send_many([notification for _, notification in batch])
+            except Exception as e:
+                # No se sabe qué llegó: el lote entero se reprograma
+                print(f"[WARN] Falló canal {channel} (lote de {len(batch)}): {e}")
+                delivered, failed = [], [row_id for row_id, _ in batch]
+            else:
+                failed_ids = {id(notification) for notification, _ in failures}
+                for _, e in failures:
+                    print(f"[WARN] Falló canal {channel}: {e}")
+                delivered = [row_id for row_id, notification in batch if id(notification) not in failed_ids]
+                failed = [row_id for row_id, notification in batch if id(notification) in failed_ids]
+            self._outbox.ack(delivered)
+            self._outbox.retry_later(failed)
+            self.flush_seconds += time.perf_counter() - start
+            self.delivered += len(delivered)
+            self.failed += len(failed)
+            processed += len(batch)
+        return processed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.flush_once()
+            except Exception as e:
+                print(f"[WARN] Falló el vaciado de la outbox: {e}")
+                processed = 0
+            if not processed:
+                self._stop.wait(self._interval)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="outbox-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, drain: bool = True) -> None:
+        """Detiene el hilo; con `drain` entrega antes todo lo que quede pendiente."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if drain:
+            self._outbox.commit()
+            while self.flush_once():
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        outbox = self._outbox
+        return {
+            "enqueued": outbox.enqueued,
+            "enqueue_per_s": outbox.enqueued / outbox.enqueue_seconds if outbox.enqueue_seconds else 0.0,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "flush_per_s": (self.delivered + self.failed) / self.flush_seconds if self.flush_seconds else 0.0,
+            "pending": outbox.pending_count(),
+            "dead": outbox.dead_count(),
+        }
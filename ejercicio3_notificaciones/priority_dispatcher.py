@@ -0,0 +1,267 @@
+# priority_dispatcher.py
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable
+
+from notifiers import Notification, Notifier, Priority
+from token_bucket import TokenBucket
+
+
+DEFAULT_WEIGHTS = {
+    Priority.LOW: 1,
+    Priority.NORMAL: 2,
+    Priority.HIGH: 4,
+    Priority.CRITICAL: 8,
+}
+
+
+class _Class:
+    """Cola de una prioridad con su "pase" de WFQ (tiempo virtual de fin)."""
+
+    __slots__ = ("priority", "queue", "stride", "pass_", "sent")
+
+    def __init__(self, priority: Priority, weight: float) -> None:
+        self.priority = priority
+        self.queue: deque[Notification] = deque()
+        self.stride = 1.0 / weight
+        self.pass_ = 0.0
+        self.sent = 0
+
+
+# =========================
+# Dispatcher por prioridades (un canal)
+# =========================
+class PriorityDispatcher:
+    """
+    Envía por `notifier` lo encolado con `submit`, repartiendo el canal entre
+    prioridades con weighted fair queuing: cada prioridad recibe una parte
+    proporcional a su peso (por defecto CRITICAL 8, HIGH 4, NORMAL 2, LOW 1),
+    así LOW nunca queda sin servicio pero tampoco compite de igual a igual.
+
+    Límites opcionales con token buckets:
+    - `channel_rate`: mensajes/s del canal; el hilo espera el token.
+    - `recipient_rate`: mensajes/s por destinatario; un destinatario sin
+      tokens no bloquea a los demás: sus mensajes se apartan (en su propia
+      cola, con una sola entrada en un heap de tiempos) hasta que tenga
+      tokens, y se sigue con el siguiente. Se guardan a lo sumo
+      `max_recipients` buckets (LRU).
+    """
+
+    def __init__(
+        self,
+        notifier: Notifier,
+        weights: dict[Priority, float] | None = None,
+        channel_rate: float | None = None,
+        channel_burst: float | None = None,
+        recipient_rate: float | None = None,
+        recipient_burst: float | None = None,
+        max_recipients: int = 10_000,
+        max_pending: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._notifier = notifier
+        self._name = notifier.__class__.__name__
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self._classes = [_Class(priority, weights[priority]) for priority in sorted(Priority, reverse=True)]
+        self._by_priority = {cls.priority: cls for cls in self._classes}
+        self._clock = clock
+        self._channel = TokenBucket(channel_rate, channel_burst, clock) if channel_rate else None
+        self._recipient_rate = recipient_rate
+        self._recipient_burst = recipient_burst
+        self._max_recipients = max_recipients
+        self._recipients: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._parked: dict[str, deque[Notification]] = {}
+        self._granted: dict[str, int] = {}
+        self._delayed: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._pending = 0
+        self._max_pending = max_pending
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closing = False
+        self.dropped = 0
+        self.deferred = 0
+        self.failed = 0
+
+    def submit(self, notification: Notification) -> bool:
+        """Encola; devuelve False si se alcanzó `max_pending`."""
+        with self._cond:
+            if self._pending >= self._max_pending or self._closing:
+                self.dropped += 1
+                return False
+            cls = self._by_priority[notification.priority]
+            if not cls.queue and cls.pass_ < self._vtime:
+                # Una cola que estuvo vacía no acumula crédito
+                cls.pass_ = self._vtime
+            cls.queue.append(notification)
+            self._pending += 1
+            self._cond.notify()
+            return True
+
+    # Decisión de scheduling
+
+    def _recipient_bucket(self, to: str) -> TokenBucket:
+        bucket = self._recipients.get(to)
+        if bucket is None:
+            bucket = self._recipients[to] = TokenBucket(self._recipient_rate, self._recipient_burst, self._clock)
+            if len(self._recipients) > self._max_recipients:
+                self._recipients.popitem(last=False)
+        else:
+            self._recipients.move_to_end(to)
+        return bucket
+
+    def _next(self, now: float) -> Notification | None:
+        # Se llama con el lock tomado
+        delayed = self._delayed
+        if delayed and delayed[0][0] <= now:
+            self._release(now)
+        while True:
+            best = None
+            for cls in self._classes:
+                if cls.queue and (best is None or cls.pass_ < best.pass_):
+                    best = cls
+            if best is None:
+                return None
+            notification = best.queue.popleft()
+            if self._recipient_rate and not self._admit(notification, now):
+                continue
+            self._vtime = best.pass_
+            best.pass_ += best.stride
+            best.sent += 1
+            self._pending -= 1
+            return notification
+
+    def _admit(self, notification: Notification, now: float) -> bool:
+        # Se llama con el lock tomado: True si el destinatario tiene token
+        to = notification.to
+        granted = self._granted.get(to)
+        if granted:
+            if granted == 1:
+                del self._granted[to]
+            else:
+                self._granted[to] = granted - 1
+            return True
+        parked = self._parked.get(to)
+        if parked is None:
+            bucket = self._recipient_bucket(to)
+            if bucket.try_acquire(now):
+                return True
+            parked = self._parked[to] = deque()
+            heapq.heappush(self._delayed, (now + bucket.delay(now), next(self._seq), to))
+        parked.append(notification)
+        self.deferred += 1
+        return False
+
+    def _release(self, now: float) -> None:
+        # Devuelve a sus colas tantos apartados como tokens tenga cada destinatario
+        delayed = self._delayed
+        released: dict[Priority, list[Notification]] = {}
+        while delayed and delayed[0][0] <= now:
+            _, _, to = heapq.heappop(delayed)
+            parked = self._parked[to]
+            bucket = self._recipient_bucket(to)
+            bucket.delay(now)  # recarga
+            count = min(len(parked), max(1, int(bucket.tokens)))
+            bucket.tokens -= count
+            self._granted[to] = self._granted.get(to, 0) + count
+            for _ in range(count):
+                notification = parked.popleft()
+                released.setdefault(notification.priority, []).append(notification)
+            if parked:
+                heapq.heappush(delayed, (now + bucket.delay(now), next(self._seq), to))
+            else:
+                del self._parked[to]
+        for priority, notifications in released.items():
+            cls = self._by_priority[priority]
+            if not cls.queue and cls.pass_ < self._vtime:
+                cls.pass_ = self._vtime
+            cls.queue.extendleft(reversed(notifications))
+
+    def next_ready(self) -> Notification | None:
+        """La próxima notificación a enviar ahora (sin esperar), o None."""
+        with self._cond:
+            now = self._clock()
+            if self._channel is not None and self._channel.delay(now):
+                return None
+            notification = self._next(now)
+            if notification is not None and self._channel is not None:
+                self._channel.try_acquire(now)
+            return notification
+
+    # Hilo de envío
+
+    def _take(self) -> Notification | None:
+        with self._cond:
+            while True:
+                if self._closing and not self._pending:
+                    return None
+                now = self._clock()
+                if self._channel is not None:
+                    wait = self._channel.delay(now)
+                    if wait:
+                        self._cond.wait(wait)
+                        continue
+                notification = self._next(now)
+                if notification is not None:
+                    if self._channel is not None:
+                        self._channel.try_acquire(now)
+                    return notification
+                self._cond.wait(self._delayed[0][0] - now if self._delayed else None)
+
+    def _run(self) -> None:
+        while True:
+            notification = self._take()
+            if notification is None:
+                return
+            try:
+                self._notifier.send(notification)
+            except Exception as e:
+                self.failed += 1
+                print(f"[WARN] Falló canal {self._name}: {e}")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"priority-{self._name}", daemon=True)
+        self._thread.start()
+
+    def close(self, drain: bool = True) -> None:
+        """Deja de aceptar; con `drain` envía lo pendiente (respetando los límites)."""
+        with self._cond:
+            self._closing = True
+            if not drain:
+                for cls in self._classes:
+                    self.dropped += len(cls.queue)
+                    cls.queue.clear()
+                self.dropped += sum(len(parked) for parked in self._parked.values())
+                self._parked.clear()
+                self._granted.clear()
+                self._delayed.clear()
+                self._pending = 0
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def metrics(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "queued": {cls.priority.name: len(cls.queue) for cls in self._classes},
+                "sent": {cls.priority.name: cls.sent for cls in self._classes},
+                "parked": sum(len(parked) for parked in self._parked.values()),
+                "deferred": self.deferred,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "recipients": len(self._recipients),
+            }
+
+    def __enter__(self) -> PriorityDispatcher:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,154 @@
+# recipients.py
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Callable, Iterable
+
+from notifiers import Notification
+
+
+# =========================
+# Reglas por tipo de destinatario (regex compiladas una sola vez)
+# =========================
+PHONE = "phone"
+EMAIL = "email"
+SLACK = "slack"
+DEVICE = "device"
+
+_E164 = re.compile(r"\+[1-9]\d{7,14}")
+_PHONE_SEPARATORS = re.compile(r"[\s().\-]")
+_EMAIL = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)*\.[A-Za-z]{2,}")
+_SLACK = re.compile(r"[#@][a-z0-9][a-z0-9._\-]{0,79}|[UCGW][A-Z0-9]{8,}")
+_DEVICE_TOKEN = re.compile(r"[A-Za-z0-9_:\-]{8,4096}")
+
+
+def _phone(raw: str) -> str | None:
+    phone = _PHONE_SEPARATORS.sub("", raw)
+    return phone if _E164.fullmatch(phone) else None
+
+
+def _email(raw: str) -> str | None:
+    email = raw.strip()
+    if not _EMAIL.fullmatch(email):
+        return None
+    local, domain = email.rsplit("@", 1)
+    return f"{local}@{domain.lower()}"
+
+
+def _slack(raw: str) -> str | None:
+    target = raw.strip()
+    if target[:1] in ("#", "@"):
+        target = target.lower()
+    return target if _SLACK.fullmatch(target) else None
+
+
+def _device(raw: str) -> str | None:
+    token = raw.strip()
+    return token if _DEVICE_TOKEN.fullmatch(token) else None
+
+
+NORMALIZERS: dict[str, Callable[[str], str | None]] = {
+    PHONE: _phone,
+    EMAIL: _email,
+    SLACK: _slack,
+    DEVICE: _device,
+}
+
+
+# =========================
+# Validador con caché
+# =========================
+class RecipientValidator:
+    """
+    Valida y normaliza destinatarios antes de despachar, sin excepciones.
+
+    Los resultados válidos van a un LRU de `cache_size` entradas y los
+    inválidos a un caché negativo aparte (de `negative_cache_size`), así un
+    destinatario malo que se repite no vuelve a pasar por la regex. Con
+    `mark_invalid` se agregan también los que el proveedor rechazó aunque
+    tengan buen formato (p. ej. un email que rebota).
+    """
+
+    def __init__(self, cache_size: int = 10_000, negative_cache_size: int = 10_000) -> None:
+        self._cache_size = cache_size
+        self._negative_cache_size = negative_cache_size
+        self._valid: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._invalid: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def normalize(self, kind: str, recipient: str) -> str | None:
+        """Destinatario normalizado, o None si no es válido para `kind`."""
+        key = (kind, recipient)
+        # Camino rápido sin lock: get/move_to_end de dict son atómicos con el GIL
+        # y un desalojo concurrente sólo convierte el acierto en fallo.
+        normalized = self._valid.get(key)
+        if normalized is not None:
+            try:
+                self._valid.move_to_end(key)
+            except KeyError:
+                pass
+            self.hits += 1
+            return normalized
+        if key in self._invalid:
+            try:
+                self._invalid.move_to_end(key)
+            except KeyError:
+                pass
+            self.hits += 1
+            self.rejected += 1
+            return None
+        normalized = NORMALIZERS[kind](recipient)
+        with self._lock:
+            self.misses += 1
+            if normalized is None:
+                self.rejected += 1
+                self._remember(self._invalid, key, None, self._negative_cache_size)
+            else:
+                self._remember(self._valid, key, normalized, self._cache_size)
+        return normalized
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key: tuple[str, str], value: Any, size: int) -> None:
+        cache[key] = value
+        if len(cache) > size:
+            cache.popitem(last=False)
+
+    def mark_invalid(self, kind: str, recipient: str) -> None:
+        key = (kind, recipient)
+        with self._lock:
+            self._valid.pop(key, None)
+            self._remember(self._invalid, key, None, self._negative_cache_size)
+
+    def filter(
+        self, kind: str, notifications: Iterable[Notification]
+    ) -> tuple[list[Notification], list[Notification]]:
+        """Separa (válidas con `to` normalizado, rechazadas) en una pasada."""
+        valid: list[Notification] = []
+        rejected: list[Notification] = []
+        normalize = self.normalize
+        for notification in notifications:
+            to = normalize(kind, notification.to)
+            if to is None:
+                rejected.append(notification)
+            elif to == notification.to:
+                valid.append(notification)
+            else:
+                valid.append(replace(notification, to=to))
+        return valid, rejected
+
+    def stats(self) -> dict[str, int]:
+        """Contadores aproximados: los aciertos se cuentan sin lock."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "rejected": self.rejected,
+                "cached_valid": len(self._valid),
+                "cached_invalid": len(self._invalid),
+            }
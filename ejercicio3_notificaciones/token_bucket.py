@@ -0,0 +1,42 @@
+# token_bucket.py
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    `rate` tokens por segundo con ráfagas de hasta `capacity`; se recarga al
+    consultarlo, sin hilos. No toma locks: quien lo usa (p. ej. el
+    PriorityDispatcher) ya serializa el acceso.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "_clock")
+
+    def __init__(self, rate: float, capacity: float | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("rate debe ser > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._clock = clock
+        self.updated = clock()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def try_acquire(self, now: float | None = None) -> bool:
+        """Toma un token si hay uno disponible ahora."""
+        self._refill(self._clock() if now is None else now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def delay(self, now: float | None = None) -> float:
+        """Segundos hasta que haya un token (0 si ya hay)."""
+        self._refill(self._clock() if now is None else now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate